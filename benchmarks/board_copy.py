@@ -0,0 +1,53 @@
+"""Measure board copy cost and allocations during a depth-6 search.
+
+Run with ``python -m benchmarks.board_copy``.
+"""
+from __future__ import annotations
+
+import sys
+import time
+import timeit
+import tracemalloc
+
+from benchmarks.positions import random_positions
+from pythello.board import Board, Color
+from pythello.player import Negamax
+from pythello.score import Score
+
+DEPTH = 6
+NUMBER = 100_000
+
+
+def main() -> None:
+    board = Board()
+    move = next(iter(board.valid_moves(Color.BLACK)))
+    board_bytes = sys.getsizeof(board)
+
+    if hasattr(board, '__dict__'):
+        board_bytes += sys.getsizeof(board.__dict__)
+
+    print(f'Board size in memory: {board_bytes} bytes')
+    copy = timeit.timeit(board.copy, number=NUMBER) / NUMBER
+    print(f'Board.copy: {copy * 1e6:.2f}us')
+    peek = timeit.timeit(lambda: board.peek(move, Color.BLACK), number=NUMBER) / NUMBER
+    print(f'Board.peek: {peek * 1e6:.2f}us')
+
+    ((position, player),) = random_positions(8, 1, 20)
+    search = Negamax(Score.BALANCED, DEPTH)
+    start = time.perf_counter()
+    search.search(position, player)
+    elapsed = time.perf_counter() - start
+
+    search = Negamax(Score.BALANCED, DEPTH)
+    tracemalloc.start()
+    search.search(position, player)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f'Depth-{DEPTH} search: {elapsed:.2f}s, {len(search.cache):,d} cached nodes, '
+        f'{current / 2**20:.1f} MiB retained, {peak / 2**20:.1f} MiB peak'
+    )
+
+
+if __name__ == '__main__':
+    main()
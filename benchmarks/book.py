@@ -0,0 +1,100 @@
+"""Build an opening book from self-play and measure what it saves.
+
+Run with ``python -m benchmarks.book [depth]``. The book is built in a temporary
+directory, then book probes are timed against searching the same positions, and
+a short self-play series is played with and without the book over a process pool that
+maps the one book file in every worker.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING
+
+from pythello.board import Board, Color
+from pythello.game import Game
+from pythello.player import BookPlayer, Negamax, OpeningBook, build_book
+from pythello.score import Score
+
+if TYPE_CHECKING:
+    from pythello.player import Player
+
+DEFAULT_DEPTH = 4
+BOOK_GAMES = 20
+BOOK_PLIES = 10
+SERIES_GAMES = 8
+WORKERS = 2
+SEED = 0
+
+
+def book_positions(size: int, book: OpeningBook) -> list[tuple[Board, Color]]:
+    """Follow book moves from the start, collecting every position in book."""
+    positions = []
+    board = Board(size)
+    player = Color.BLACK
+
+    while (entry := book.probe(board, player)) is not None:
+        positions.append((board.copy(), player))
+        board.apply(entry.move, player)
+        player = player.opponent
+
+    return positions
+
+
+def series(player: Player) -> float:
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        Game.series(Board(), player, player, SERIES_GAMES, seed=SEED, workers=WORKERS)
+
+    return time.perf_counter() - start
+
+
+def main(depth: int) -> None:
+    searcher = Negamax(Score.BALANCED, depth)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'opening.book')
+        start = time.perf_counter()
+        count = build_book(path, searcher, BOOK_GAMES, BOOK_PLIES, seed=SEED)
+        elapsed = time.perf_counter() - start
+        print(
+            f'built {count} entries at depth {depth} in {elapsed:.1f}s, '
+            f'{os.path.getsize(path):,d} bytes'
+        )
+
+        with OpeningBook(path) as book:
+            positions = book_positions(8, book)
+            start = time.perf_counter()
+
+            for board, player in positions:
+                book.probe(board, player)
+
+            probe = (time.perf_counter() - start) / len(positions)
+            # a fresh searcher, so the search is not answered from its cache
+            fresh = Negamax(Score.BALANCED, depth)
+            start = time.perf_counter()
+
+            for board, player in positions:
+                fresh.search(board, player)
+
+            search = (time.perf_counter() - start) / len(positions)
+            print(
+                f'{len(positions)} book positions: probe {probe * 1e6:.1f}us, '
+                f'search {search * 1e3:.1f}ms, {search / probe:,.0f}x'
+            )
+
+            plain = series(searcher)
+            booked = series(BookPlayer(book, searcher))
+            print(
+                f'{SERIES_GAMES} games over {WORKERS} workers: '
+                f'search only {plain:.1f}s, with book {booked:.1f}s'
+            )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEPTH)
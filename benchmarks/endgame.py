@@ -0,0 +1,39 @@
+"""Time the exact endgame solver on 8x8 positions with few empty squares.
+
+Run with ``python -m benchmarks.endgame [empties ...]``.
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from benchmarks.positions import random_endgames
+from pythello.player.negamax.endgame import EndgameSolver
+
+DEFAULT_EMPTIES = (14, 16, 18, 20)
+NUM_POSITIONS = 3
+
+
+def main(empties: list[int]) -> None:
+    for count in empties:
+        for wld in (True, False):
+            solver = EndgameSolver(wld=wld)
+            nodes = 0
+            scores = []
+            start = time.perf_counter()
+
+            for board, player in random_endgames(8, NUM_POSITIONS, count):
+                _, score = solver.solve(board, player)
+                nodes += solver.nodes
+                scores.append(score)
+
+            elapsed = time.perf_counter() - start
+            mode = 'wld' if wld else 'exact'
+            print(
+                f'{count} empties {mode:>5}: {nodes:11,d} nodes {elapsed:8.2f}s '
+                f'{nodes / elapsed:9,.0f} nodes/s scores {scores}'
+            )
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or list(DEFAULT_EMPTIES))
@@ -0,0 +1,59 @@
+"""Compare fused feature extraction against scoring each feature separately.
+
+Run with ``python -m benchmarks.evaluate``. The reference scores every weighted
+feature once per player and checks for the end of the game with two more move
+generations, as scorers did before ``Board.features``.
+"""
+from __future__ import annotations
+
+import timeit
+from typing import TYPE_CHECKING, cast
+
+from benchmarks.positions import random_positions
+from pythello.score import Score, WeightedScore
+from pythello.score.score import WIN_BONUS
+
+if TYPE_CHECKING:
+    from pythello.board import Board, Color
+
+PLIES = (10, 20, 30, 40, 50)
+NUM_POSITIONS = 50
+SCORES = (Score.EDGE, Score.BALANCED)
+
+
+def reference(score: Score, board: Board, player: Color) -> float:
+    if board.moves(player) == 0 and board.moves(player.opponent) == 0:
+        return board.score(player) * WIN_BONUS
+
+    opponent = player.opponent
+    weighted = cast(WeightedScore, score.scorer)
+    return sum(
+        (scorer(board, player) - scorer(board, opponent)) * weight
+        for scorer, weight in weighted.scorers.items()
+    )
+
+
+def bench(score: Score, suite: list[tuple[Board, Color]]) -> None:
+    for board, player in suite:
+        if score(board, player) != reference(score, board, player):
+            raise AssertionError(f'{score.name} differs on {board.players}')
+
+    timings = {
+        'separate': lambda: [reference(score, b, p) for b, p in suite],
+        'current': lambda: [score(b, p) for b, p in suite],
+    }
+
+    for name, func in timings.items():
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        print(f'{score.name:>8} {name:>8}: {len(suite) / seconds:10,.0f} evals/s')
+
+
+if __name__ == '__main__':
+    suite = [
+        position
+        for plies in PLIES
+        for position in random_positions(8, NUM_POSITIONS, plies)
+    ]
+
+    for score in SCORES:
+        bench(score, suite)
@@ -0,0 +1,41 @@
+"""Measure garbage collector activity and peak RSS during a deep search.
+
+Run with ``python -m benchmarks.gc_pressure [depth]``. Peak RSS is process-wide,
+so run each configuration in a fresh interpreter.
+"""
+from __future__ import annotations
+
+import gc
+import resource
+import sys
+import time
+
+from benchmarks.positions import random_positions
+from pythello.player import Negamax
+from pythello.score import Score
+
+DEFAULT_DEPTH = 6
+
+
+def collections() -> list[int]:
+    return [generation['collections'] for generation in gc.get_stats()]
+
+
+def main(depth: int) -> None:
+    ((board, player),) = random_positions(8, 1, 20)
+    search = Negamax(Score.BALANCED, depth)
+    before = collections()
+    start = time.perf_counter()
+    search.search(board, player)
+    elapsed = time.perf_counter() - start
+    after = collections()
+    runs = [b - a for a, b in zip(before, after)]
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f'Depth-{depth} search: {elapsed:.2f}s, {len(search.cache):,d} cached nodes')
+    print(f'GC collections per generation: {runs}')
+    print(f'Peak RSS: {peak:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEPTH)
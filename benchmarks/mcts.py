@@ -0,0 +1,65 @@
+"""Measure MCTS playouts per second and how much of the tree survives a move.
+
+Run with ``python -m benchmarks.mcts [playouts]``. Each size is searched from a
+suite of opening positions with and without priors, then one game against the
+random player shows the share of the playouts reused from the previous move.
+"""
+from __future__ import annotations
+
+import random
+import sys
+
+from benchmarks.positions import random_positions
+from pythello.board import Board
+from pythello.game import Game
+from pythello.player import AI, MCTS
+from pythello.score import Score
+
+DEFAULT_PLAYOUTS = 500
+SIZES = (8, 10, 12)
+NUM_POSITIONS = 5
+PLIES = 10
+SEED = 0
+
+
+def bench(size: int, playouts: int) -> None:
+    suite = random_positions(size, NUM_POSITIONS, PLIES)
+
+    for scorer in (None, Score.BALANCED):
+        search = MCTS(scorer, playouts)
+        completed = 0
+        seconds = 0.0
+
+        for board, player in suite:
+            search.reset()
+            search.search(board, player)
+            completed += search.completed
+            seconds += search.seconds
+
+        name = 'uct' if scorer is None else f'uct + {scorer.name.lower()}'
+        print(f'size {size:2d} {name:>16}: {completed / seconds:8,.0f} playouts/s')
+
+
+def reuse(playouts: int) -> None:
+    random.seed(SEED)
+    search = MCTS(Score.BALANCED, playouts)
+    game = Game(Board(), search, AI.RANDOM)
+    shares = []
+
+    while not game.is_over:
+        searched = game.current_player.player is search
+        game.move()
+
+        if searched:
+            shares.append(search.reused / (search.reused + search.completed))
+
+    print(f'reused {sum(shares) / len(shares):.0%} of the playouts per move')
+
+
+if __name__ == '__main__':
+    playouts = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PLAYOUTS
+
+    for size in SIZES:
+        bench(size, playouts)
+
+    reuse(playouts)
@@ -0,0 +1,162 @@
+"""Compare Kogge-Stone move generation against the original serial flood loop.
+
+Run with ``python -m benchmarks.movegen``.
+"""
+from __future__ import annotations
+
+import random
+import timeit
+from operator import lshift, rshift
+from typing import TYPE_CHECKING
+
+from pythello.board import Board, Color
+from pythello.board import mask as board_mask
+from pythello.board import split_position
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pythello.board import Position
+
+    Shift = tuple[Callable[[int, int], int], int, int]
+
+SIZES = (4, 6, 8, 10, 12, 16)
+NUM_GAMES = 20
+SEED = 0
+
+
+def serial_shifts(size: int) -> tuple[Shift, ...]:
+    """Build the (operator, bits, mask) triples used by the original serial loop."""
+    right_mask = board_mask.right_mask(size)
+    left_mask = board_mask.left_mask(size)
+    full_mask = board_mask.full_mask(size)
+    return (
+        (rshift, 1, right_mask),
+        (rshift, size + 1, right_mask >> size),
+        (rshift, size, full_mask),
+        (rshift, size - 1, left_mask >> size),
+        (lshift, 1, left_mask),
+        (lshift, size + 1, (left_mask << size) & full_mask),
+        (lshift, size, full_mask),
+        (lshift, size - 1, (right_mask << size) & full_mask),
+    )
+
+
+def serial_moves(
+    board: Board, player: Color, shifts: tuple[Shift, ...], full_mask: int
+) -> int:
+    current = board.players[player]
+    opponent = board.players[player.opponent]
+    empty = (current | opponent) ^ full_mask
+    moves = 0
+
+    for operator, bits, mask in shifts:
+        opponent_mask = mask & opponent
+        x = operator(current, bits) & opponent_mask
+
+        for _ in range(board.size - 3):
+            x |= operator(x, bits) & opponent_mask
+
+        moves |= operator(x, bits) & mask & empty
+
+    return moves
+
+
+def serial_captured(
+    board: Board, player: Color, move: Position, shifts: tuple[Shift, ...]
+) -> int:
+    current = board.players[player]
+    opponent = board.players[player.opponent]
+    captured = move
+
+    for operator, bits, mask in shifts:
+        opponent_mask = mask & opponent
+        x = operator(move, bits) & opponent_mask
+
+        for _ in range(board.size - 3):
+            x |= operator(x, bits) & opponent_mask
+
+        if (operator(x, bits) & mask & current) != 0:
+            captured |= x
+
+    return captured
+
+
+def positions(size: int, rng: random.Random) -> list[tuple[Board, Color]]:
+    """Collect every position reached in a handful of random games."""
+    board = Board(size)
+    result = []
+
+    for _ in range(NUM_GAMES):
+        board.reset()
+        player = Color.BLACK
+
+        while True:
+            moves = board.valid_moves(player)
+
+            if not moves:
+                player = player.opponent
+                moves = board.valid_moves(player)
+
+                if not moves:
+                    break
+
+            result.append((board.copy(), player))
+            board.place_piece(rng.choice(sorted(moves)), player)
+            player = player.opponent
+
+    return result
+
+
+def check(size: int, suite: list[tuple[Board, Color]]) -> None:
+    shifts = serial_shifts(size)
+    full_mask = board_mask.full_mask(size)
+
+    for board, player in suite:
+        moves = serial_moves(board, player, shifts, full_mask)
+
+        if moves != board.moves(player):
+            raise AssertionError(f'Move mismatch on size {size}: {board.players}')
+
+        for move in split_position(moves):
+            expected = serial_captured(board, player, move, shifts)
+
+            if expected != board._captured(player, move)[2]:
+                raise AssertionError(f'Flip mismatch on size {size}: {board.players}')
+
+
+def bench(size: int, suite: list[tuple[Board, Color]]) -> None:
+    shifts = serial_shifts(size)
+    full_mask = board_mask.full_mask(size)
+    flips = [
+        (board, player, move)
+        for board, player in suite
+        for move in board.valid_moves(player)
+    ]
+
+    def run(func: Callable[[], object]) -> float:
+        return min(timeit.repeat(func, number=1, repeat=5))
+
+    timings = {
+        'serial moves': run(
+            lambda: [serial_moves(b, p, shifts, full_mask) for b, p in suite]
+        ),
+        'kogge-stone moves': run(lambda: [b.moves(p) for b, p in suite]),
+        'serial flips': run(
+            lambda: [serial_captured(b, p, m, shifts) for b, p, m in flips]
+        ),
+        'kogge-stone flips': run(lambda: [b._captured(p, m) for b, p, m in flips]),
+    }
+
+    for name, seconds in timings.items():
+        count = len(flips) if name.endswith('flips') else len(suite)
+        print(f'size {size:2d} {name:>18}: {count / seconds:12,.0f}/s')
+
+
+if __name__ == '__main__':
+    rng = random.Random(SEED)
+
+    for size in SIZES:
+        suite = positions(size, rng)
+        check(size, suite)
+        bench(size, suite)
@@ -0,0 +1,47 @@
+"""Compare alpha-beta move ordering against unordered search at equal depth.
+
+Run with ``python -m benchmarks.ordering [depth]``.
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from benchmarks.positions import random_positions
+from pythello.player import Negamax
+from pythello.score import Score
+
+DEFAULT_DEPTH = 4
+NUM_POSITIONS = 10
+PLIES = (10, 20, 30)
+
+
+def main(depth: int) -> None:
+    suite = [
+        position
+        for plies in PLIES
+        for position in random_positions(8, NUM_POSITIONS, plies)
+    ]
+
+    for ordering in (False, True):
+        nodes = cutoffs = first_move_cutoffs = 0
+        start = time.perf_counter()
+
+        for board, player in suite:
+            search = Negamax(Score.BALANCED, depth, ordering=ordering)
+            search.search(board, player)
+            nodes += search.nodes
+            cutoffs += search.cutoffs
+            first_move_cutoffs += search.first_move_cutoffs
+
+        elapsed = time.perf_counter() - start
+        name = 'ordered' if ordering else 'unordered'
+        rate = first_move_cutoffs / cutoffs if cutoffs else 0.0
+        print(
+            f'{name:>9} depth {depth}: {nodes:9,d} nodes {elapsed:7.2f}s '
+            f'first-move cutoffs {rate:6.1%}'
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEPTH)
@@ -0,0 +1,67 @@
+"""Measure root-parallel Negamax speedup against the serial search.
+
+Run with ``python -m benchmarks.parallel [depth]``. Speedup is serial time over
+parallel time and efficiency is speedup per worker, so both are only meaningful
+with at least as many cores as workers.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+from benchmarks.positions import random_positions
+from pythello.player import Negamax
+from pythello.score import Score
+
+DEFAULT_DEPTH = 5
+NUM_POSITIONS = 5
+PLIES = (10, 20)
+WARMUP_PLIES = 4
+WORKERS = (2, 4, 8, 16)
+
+
+def run(depth: int, workers: int | None) -> tuple[float, list[float | None]]:
+    suite = [
+        position
+        for plies in PLIES
+        for position in random_positions(8, NUM_POSITIONS, plies)
+    ]
+    search = Negamax(Score.BALANCED, depth, workers=workers)
+    scores = []
+
+    if workers is not None:
+        # start the pool outside the timing, on a position outside the suite
+        search.search(*random_positions(8, 1, WARMUP_PLIES)[0])
+
+    start = time.perf_counter()
+
+    for board, player in suite:
+        search.search(board, player)
+        scores.append(search.score)
+
+    elapsed = time.perf_counter() - start
+    search.close()
+    return elapsed, scores
+
+
+def main(depth: int) -> None:
+    print(f'{os.cpu_count()} cores available')
+    serial, reference = run(depth, None)
+    print(f'serial depth {depth}: {serial:7.2f}s')
+
+    for workers in WORKERS:
+        elapsed, scores = run(depth, workers)
+
+        if scores != reference:
+            raise AssertionError(f'{workers} workers disagree with the serial scores')
+
+        speedup = serial / elapsed
+        print(
+            f'{workers:2d} workers depth {depth}: {elapsed:7.2f}s '
+            f'speedup {speedup:5.2f} efficiency {speedup / workers:6.1%}'
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEPTH)
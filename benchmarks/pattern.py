@@ -0,0 +1,64 @@
+"""Compare the pattern table evaluator against the weighted feature scores.
+
+Run with ``python -m benchmarks.pattern [path]``. Without a weights file the
+untrained tables are used and checked against the positional square values they
+are seeded from, since they must sum to the same score.
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+from typing import TYPE_CHECKING
+
+from benchmarks.positions import random_positions
+from pythello.score import PatternScore, Score, ScorerWrapper
+from pythello.score.pattern import SIZE, SQUARE_VALUES, square_coverage
+
+if TYPE_CHECKING:
+    from pythello.board import Board, Color
+    from pythello.score import Scorer
+
+PLIES = (10, 20, 30, 40, 50)
+NUM_POSITIONS = 50
+
+
+def reference(board: Board, player: Color) -> float:
+    """Sum the square values of every square some pattern covers."""
+    current = board.players[player]
+    opponent = board.players[player.opponent]
+    score = 0.0
+
+    for square, count in enumerate(square_coverage()):
+        if count:
+            value = SQUARE_VALUES[square // SIZE][square % SIZE]
+            score += value * ((current >> square & 1) - (opponent >> square & 1))
+
+    return score
+
+
+def bench(name: str, scorer: Scorer, suite: list[tuple[Board, Color]]) -> None:
+    seconds = min(
+        timeit.repeat(lambda: [scorer(b, p) for b, p in suite], number=1, repeat=5)
+    )
+    print(f'{name:>8}: {len(suite) / seconds:10,.0f} evals/s')
+
+
+if __name__ == '__main__':
+    suite = [
+        position
+        for plies in PLIES
+        for position in random_positions(8, NUM_POSITIONS, plies)
+    ]
+
+    if len(sys.argv) > 1:
+        pattern = PatternScore.load(sys.argv[1])
+    else:
+        pattern = PatternScore.initial()
+
+        for board, player in suite:
+            if abs(pattern(board, player) - reference(board, player)) > 1e-3:
+                raise AssertionError(f'pattern differs on {board.players}')
+
+    bench('pattern', pattern, suite)
+    bench('wrapped', ScorerWrapper(pattern), suite)
+    bench('balanced', Score.BALANCED, suite)
@@ -0,0 +1,127 @@
+"""Count the leaves of the game tree to check and time move generation.
+
+Run with ``python -m benchmarks.perft [--size N] [--depth D]``. A pass takes a
+ply and a finished game is a leaf at whatever depth it ends, the usual perft
+rules for Othello. Every count is checked against the stored reference for its
+size and depth before the leaves per second are reported.
+
+With ``--baseline PATH`` the rates are compared against those saved in the file
+by an earlier run with ``--save``, and the run fails when any of them falls more
+than ``--threshold`` below its baseline.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+
+from pythello.board import Board, Color, iterate_position
+
+# leaf counts from depth 1, counted once by a plain square-by-square move
+# generator; the 8x8 counts agree with the published ones
+REFERENCE = {
+    4: (4, 12, 44, 128, 424, 1256, 3624, 9116, 20044, 36540, 50704, 57436),
+    6: (4, 12, 56, 244, 1364, 7604, 47740, 308716, 2114912),
+    8: (4, 12, 56, 244, 1396, 8200, 55092, 390216, 3005288),
+    10: (4, 12, 56, 244, 1396),
+}
+DEFAULT_DEPTHS = {4: 10, 6: 7, 8: 7, 10: 5}
+DEFAULT_THRESHOLD = 0.2
+REPEATS = 3
+
+
+def perft(board: Board, player: Color, depth: int) -> int:
+    """Count the positions reached after the given number of plies."""
+    if depth == 0:
+        return 1
+
+    moves = board.moves(player)
+    opponent = player.opponent
+
+    if moves == 0:
+        if not board.has_moves(opponent):
+            return 1
+
+        return perft(board, opponent, depth - 1)
+
+    if depth == 1:
+        return moves.bit_count()
+
+    total = 0
+
+    for move in iterate_position(moves):
+        flips = board.apply(move, player)
+        total += perft(board, opponent, depth - 1)
+        board.undo(move, flips, player)
+
+    return total
+
+
+def run(size: int, depth: int) -> float:
+    """Check the count of one size and depth, and return the leaves per second."""
+    reference = REFERENCE[size]
+
+    if depth > len(reference):
+        raise ValueError(f'No reference count for size {size} at depth {depth}')
+
+    best = float('inf')
+
+    for _ in range(REPEATS):
+        board = Board(size)
+        start = time.perf_counter()
+        count = perft(board, Color.BLACK, depth)
+        best = min(best, time.perf_counter() - start)
+
+        if count != reference[depth - 1]:
+            raise AssertionError(
+                f'perft({depth}) on {size}x{size} is {count:,d}, '
+                f'expected {reference[depth - 1]:,d}'
+            )
+
+    rate = count / best
+    print(f'{size:2d}x{size:<2d} depth {depth:2d}: {count:11,d} leaves {rate:12,.0f}/s')
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.perft')
+    parser.add_argument('--size', type=int, choices=sorted(REFERENCE))
+    parser.add_argument('--depth', type=int)
+    parser.add_argument('--baseline', help='JSON file of leaves per second by size')
+    parser.add_argument('--save', action='store_true', help='overwrite the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    sizes = list(REFERENCE) if args.size is None else [args.size]
+    rates = {str(size): run(size, args.depth or DEFAULT_DEPTHS[size]) for size in sizes}
+
+    if args.baseline is None:
+        return
+
+    if args.save:
+        with open(args.baseline, 'w') as file:
+            json.dump(rates, file, indent=4)
+            file.write('\n')
+
+        return
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+
+    failed = False
+
+    for size, rate in rates.items():
+        if size not in baseline:
+            continue
+
+        change = rate / baseline[size] - 1
+        print(f'{size}x{size}: {change:+.1%} against the baseline')
+        failed |= change < -args.threshold
+
+    if failed:
+        sys.exit(f'Move generation regressed by more than {args.threshold:.0%}')
+
+
+if __name__ == '__main__':
+    main()
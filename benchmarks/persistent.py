@@ -0,0 +1,86 @@
+"""Measure how much a persistent transposition table saves on a second run.
+
+Run with ``python -m benchmarks.persistent [depth]``. The suite is searched by
+two searchers opened one after the other on the same file, standing in for two
+runs of the program, and then by two processes sharing the file at once.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.positions import random_positions
+from pythello.board import Board
+from pythello.game import Game
+from pythello.player import Negamax
+from pythello.player.negamax import PersistentTable
+from pythello.score import Score, scorer_signature
+
+DEFAULT_DEPTH = 5
+CACHE_MB = 16.0
+NUM_POSITIONS = 10
+PLIES = (20, 30)
+SERIES_GAMES = 4
+WORKERS = 2
+
+
+def run(path: str, depth: int, name: str) -> None:
+    search = Negamax(Score.BALANCED, depth, cache_mb=CACHE_MB, cache_path=path)
+
+    if not isinstance(search.cache, PersistentTable):
+        raise TypeError('Expected a persistent table')
+
+    loaded = search.cache.loaded
+    nodes = 0
+    start = time.perf_counter()
+
+    for plies in PLIES:
+        for board, player in random_positions(8, NUM_POSITIONS, plies):
+            search.search(board, player)
+            nodes += search.nodes
+
+    elapsed = time.perf_counter() - start
+    search.close()
+    search.cache.close()
+    print(f'{name}: {loaded:7,d} entries loaded, {nodes:9,d} nodes, {elapsed:6.2f}s')
+
+
+def shared(path: str, depth: int) -> None:
+    """Play a series over several processes writing the same table."""
+    search = Negamax(Score.BALANCED, depth, cache_mb=CACHE_MB, cache_path=path)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        Game.series(Board(), search, search, SERIES_GAMES, workers=WORKERS)
+
+    if isinstance(search.cache, PersistentTable):
+        search.cache.close()
+
+    table = PersistentTable(path, CACHE_MB, signature=scorer_signature(Score.BALANCED))
+    torn = sum(
+        table.get(table._keys[slot]) is None
+        for slot, flag in enumerate(table._flags)
+        if flag
+    )
+    print(
+        f'{WORKERS} processes: {len(table):,d} entries written, '
+        f'{torn} torn by concurrent writes and read as misses'
+    )
+    table.close()
+
+
+def main(depth: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'negamax.table')
+        run(path, depth, 'cold')
+        run(path, depth, 'warm')
+
+    with tempfile.TemporaryDirectory() as directory:
+        shared(os.path.join(directory, 'negamax.table'), depth - 2)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEPTH)
@@ -0,0 +1,74 @@
+"""Reproducible position suites shared by the benchmarks."""
+from __future__ import annotations
+
+import random
+
+from pythello.board import Board, Color
+
+DEFAULT_SEED = 0
+
+
+def random_positions(
+    size: int, count: int, plies: int, seed: int = DEFAULT_SEED
+) -> list[tuple[Board, Color]]:
+    """Return positions reached after playing random moves for a number of plies.
+
+    Games that end early are discarded, so every position has a move to play.
+    """
+    rng = random.Random(seed)
+    result: list[tuple[Board, Color]] = []
+
+    while len(result) < count:
+        board = Board(size)
+        player = Color.BLACK
+
+        for _ in range(plies):
+            moves = sorted(board.valid_moves(player))
+
+            if not moves:
+                player = player.opponent
+                moves = sorted(board.valid_moves(player))
+
+                if not moves:
+                    break
+
+            board.place_piece(rng.choice(moves), player)
+            player = player.opponent
+        else:
+            if board.valid_moves(player):
+                result.append((board, player))
+
+    return result
+
+
+def random_endgames(
+    size: int, count: int, empties: int, seed: int = DEFAULT_SEED
+) -> list[tuple[Board, Color]]:
+    """Return positions with the given number of empty squares from random games.
+
+    Games that end early are discarded, so every position has a move to play.
+    """
+    rng = random.Random(seed)
+    result: list[tuple[Board, Color]] = []
+
+    while len(result) < count:
+        board = Board(size)
+        player = Color.BLACK
+
+        while board.num_empty > empties:
+            moves = sorted(board.valid_moves(player))
+
+            if not moves:
+                player = player.opponent
+                moves = sorted(board.valid_moves(player))
+
+                if not moves:
+                    break
+
+            board.place_piece(rng.choice(moves), player)
+            player = player.opponent
+        else:
+            if board.valid_moves(player):
+                result.append((board, player))
+
+    return result
@@ -0,0 +1,57 @@
+"""Compare plain alpha-beta with principal variation search and aspiration windows.
+
+Run with ``python -m benchmarks.pvs [depth]``. Every variant must agree on the
+root score at each position.
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from benchmarks.positions import random_positions
+from pythello.player import Negamax
+from pythello.score import Score
+
+DEFAULT_DEPTH = 5
+NUM_POSITIONS = 10
+PLIES = (10, 20, 30)
+WINDOW = 8.0
+
+VARIANTS: dict[str, dict[str, object]] = {
+    'alpha-beta': {},
+    'pvs': {'pvs': True},
+    'pvs + aspiration': {'pvs': True, 'aspiration': WINDOW},
+}
+
+
+def main(depth: int) -> None:
+    suite = [
+        position
+        for plies in PLIES
+        for position in random_positions(8, NUM_POSITIONS, plies)
+    ]
+    scores: dict[str, list[float | None]] = {}
+
+    for name, options in VARIANTS.items():
+        nodes = 0
+        scores[name] = []
+        start = time.perf_counter()
+
+        for board, player in suite:
+            search = Negamax(Score.BALANCED, depth, **options)  # type: ignore[arg-type]
+            search.search(board, player)
+            nodes += search.nodes
+            scores[name].append(search.score)
+
+        elapsed = time.perf_counter() - start
+        print(f'{name:>16} depth {depth}: {nodes:9,d} nodes {elapsed:7.2f}s')
+
+    reference = scores['alpha-beta']
+
+    for name, values in scores.items():
+        if values != reference:
+            raise AssertionError(f'{name} disagrees with alpha-beta on root scores')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEPTH)
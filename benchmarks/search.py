@@ -0,0 +1,55 @@
+"""Measure Negamax search throughput on a fixed position suite.
+
+Run with ``python -m benchmarks.search [depth]``. Nodes are counted as interior
+nodes stored in the transposition table plus leaf evaluations.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from typing import TYPE_CHECKING
+
+from benchmarks.positions import random_positions
+from pythello.player import Negamax
+from pythello.score import Score
+
+if TYPE_CHECKING:
+    from pythello.board import Board, Color
+
+DEFAULT_DEPTH = 4
+NUM_POSITIONS = 10
+PLIES = (10, 20, 30)
+
+
+class CountingScorer:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, board: Board, player: Color) -> float:
+        self.count += 1
+        return Score.BALANCED(board, player)
+
+
+def main(depth: int) -> None:
+    for plies in PLIES:
+        suite = random_positions(8, NUM_POSITIONS, plies)
+        scorer = CountingScorer()
+        nodes = 0
+        elapsed = 0.0
+
+        for board, player in suite:
+            search = Negamax(scorer, depth)
+            start = time.perf_counter()
+            search.search(board, player)
+            elapsed += time.perf_counter() - start
+            nodes += len(search.cache)
+
+        nodes += scorer.count
+        print(
+            f'ply {plies:2d} depth {depth}: {nodes:9,d} nodes '
+            f'{elapsed:7.2f}s {nodes / elapsed:10,.0f} nodes/s'
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEPTH)
@@ -0,0 +1,63 @@
+"""Measure what counting stable discs adds to the cost of a leaf.
+
+Run with ``python -m benchmarks.stability``. Stable discs are found for midgame
+and endgame positions alone, then scored as one more weighted feature next to
+the balanced features.
+"""
+from __future__ import annotations
+
+import timeit
+from typing import TYPE_CHECKING
+
+from benchmarks.positions import random_endgames, random_positions
+from pythello.board import Board
+from pythello.score import Score, WeightedScore
+
+if TYPE_CHECKING:
+    from pythello.board import Color
+    from pythello.score import Scorer
+
+PLIES = (20, 30, 40)
+EMPTIES = (10, 14)
+NUM_POSITIONS = 50
+
+STABLE = WeightedScore(
+    {
+        Board.player_corners: 16,
+        Board.player_edges: 4,
+        Board.num_moves: 2,
+        Board.player_interior: 1,
+        Board.player_frontier: -1,
+        Board.player_stable: 8,
+    }
+)
+
+
+def bench(name: str, scorer: Scorer, suite: list[tuple[Board, Color]]) -> None:
+    seconds = min(
+        timeit.repeat(lambda: [scorer(b, p) for b, p in suite], number=1, repeat=5)
+    )
+    print(f'{name:>16}: {seconds / len(suite) * 1e6:6.2f}us per position')
+
+
+if __name__ == '__main__':
+    suites = {
+        'midgame': [
+            position
+            for plies in PLIES
+            for position in random_positions(8, NUM_POSITIONS, plies)
+        ],
+        'endgame': [
+            position
+            for empties in EMPTIES
+            for position in random_endgames(8, NUM_POSITIONS, empties)
+        ],
+    }
+
+    for name, suite in suites.items():
+        stable = sum(board.player_stable(player) for board, player in suite)
+        print(f'{name}: {stable / len(suite):.1f} stable discs per position')
+        bench('stable', Board.player_stable, suite)
+        bench('moves', Board.num_moves, suite)
+        bench('balanced', Score.BALANCED, suite)
+        bench('balanced+stable', STABLE, suite)
@@ -0,0 +1,55 @@
+"""Measure what keeping search stats costs and show the stats of one search.
+
+Run with ``python -m benchmarks.stats [depth]``. The suite is searched with
+stats disabled and enabled in alternation, and the stats of the last search are
+printed as JSON.
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from benchmarks.positions import random_positions
+from pythello.player import Negamax
+from pythello.score import Score
+
+DEFAULT_DEPTH = 5
+CACHE_MB = 4.0
+NUM_POSITIONS = 10
+PLIES = (20, 30)
+REPEATS = 3
+
+
+def run(depth: int, stats: bool) -> tuple[float, Negamax]:
+    elapsed = 0.0
+
+    for plies in PLIES:
+        for board, player in random_positions(8, NUM_POSITIONS, plies):
+            search = Negamax(
+                Score.BALANCED, depth, cache_mb=CACHE_MB, aspiration=4.0, stats=stats
+            )
+            start = time.perf_counter()
+            search.search(board, player)
+            elapsed += time.perf_counter() - start
+
+    return elapsed, search
+
+
+def main(depth: int) -> None:
+    timings: dict[bool, list[float]] = {False: [], True: []}
+
+    for _ in range(REPEATS):
+        for stats in (False, True):
+            elapsed, search = run(depth, stats)
+            timings[stats].append(elapsed)
+
+    for stats, samples in timings.items():
+        name = 'on' if stats else 'off'
+        print(f'stats {name:>3}: best of {REPEATS} {min(samples):.2f}s')
+
+    if search.stats is not None:
+        print(search.stats.to_json(indent=2))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEPTH)
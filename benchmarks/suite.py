@@ -0,0 +1,313 @@
+"""Time the hot paths end to end and track regressions between runs.
+
+Run with ``python -m benchmarks.suite run [--output PATH]`` to time every case
+after a warmup and write the samples as JSON, and with ``python -m
+benchmarks.suite compare BEFORE AFTER`` to compare two result files. A case is
+flagged when a one-sided Mann-Whitney U test finds its samples slower at the
+chosen significance level and its median slowed by more than the minimum
+change, and the comparison fails when any case is flagged.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from benchmarks.positions import random_positions
+from pythello.board import Board, split_position
+from pythello.game import Game
+from pythello.player import AI, Negamax
+from pythello.score import Score
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pythello.board import Color
+
+NUM_POSITIONS = 25
+PLIES = (10, 20, 30, 40)
+SEARCH_DEPTHS = (2, 3, 4)
+SEARCH_POSITIONS = 5
+SERIES_GAMES = 2
+SERIES_SEED = 0
+# the timed AI members spend their time limit on every move, whatever the code costs
+SERIES_PLAYERS = (AI.RANDOM, AI.GREEDY, AI.EDGE, AI.BALANCED, AI.NEGAMAX)
+DEFAULT_WARMUP = 1
+# short cases are run several times per sample to last at least this long
+MIN_SAMPLE_SECONDS = 0.05
+DEFAULT_REPEATS = 10
+DEFAULT_ALPHA = 0.01
+DEFAULT_MIN_CHANGE = 0.05
+
+
+class Case(NamedTuple):
+    name: str
+    units: int
+    unit: str
+    run: Callable[[], object]
+
+
+class Comparison(NamedTuple):
+    name: str
+    before: float
+    after: float
+    change: float
+    p_value: float
+    slower: bool
+
+
+def score_case(suite: list[tuple[Board, Color]], score: Score) -> Case:
+    def run() -> None:
+        for board, player in suite:
+            score(board, player)
+
+    return Case(f'score {score.name.lower()}', len(suite), 'evals', run)
+
+
+def search_case(suite: list[tuple[Board, Color]], depth: int) -> Case:
+    def run() -> None:
+        for board, player in suite:
+            Negamax(Score.BALANCED, depth).search(board, player)
+
+    return Case(f'negamax depth {depth}', len(suite), 'searches', run)
+
+
+def series_case(player1: AI, player2: AI) -> Case:
+    board = Board()
+
+    def run() -> None:
+        # the series prints every result, which is not what is timed
+        with contextlib.redirect_stdout(io.StringIO()):
+            Game.series(board, player1, player2, SERIES_GAMES, seed=SERIES_SEED)
+
+    name = f'series {player1.name.lower()} vs {player2.name.lower()}'
+    return Case(name, SERIES_GAMES, 'games', run)
+
+
+def cases() -> list[Case]:
+    """Build every case on fixed positions, in the order they are run."""
+    suite = [
+        position
+        for plies in PLIES
+        for position in random_positions(8, NUM_POSITIONS, plies)
+    ]
+    flips = [
+        (board, player, move)
+        for board, player in suite
+        for move in split_position(board.moves(player))
+    ]
+    masks = [board.moves(player) for board, player in suite]
+    result = [
+        Case(
+            'valid_moves',
+            len(suite),
+            'calls',
+            lambda: [board.valid_moves(player) for board, player in suite],
+        ),
+        Case(
+            '_captured',
+            len(flips),
+            'calls',
+            lambda: [board._captured(player, move) for board, player, move in flips],
+        ),
+        Case(
+            'split_position',
+            len(masks),
+            'calls',
+            lambda: [split_position(moves) for moves in masks],
+        ),
+        Case('copy', len(suite), 'calls', lambda: [board.copy() for board, _ in suite]),
+    ]
+
+    result.extend(score_case(suite, score) for score in Score)
+    searches = random_positions(8, SEARCH_POSITIONS, 20)
+    result.extend(search_case(searches, depth) for depth in SEARCH_DEPTHS)
+    result.extend(
+        series_case(player1, player2)
+        for player1, player2 in itertools.combinations(SERIES_PLAYERS, 2)
+    )
+    return result
+
+
+def calibrate(case: Case) -> int:
+    """Return how many runs of a case make up one sample of the minimum length."""
+    number = 1
+
+    while True:
+        start = time.perf_counter()
+
+        for _ in range(number):
+            case.run()
+
+        if time.perf_counter() - start >= MIN_SAMPLE_SECONDS:
+            return number
+
+        number *= 2
+
+
+def measure(case: Case, number: int, warmup: int, repeats: int) -> list[float]:
+    """Return the seconds per run of a case over each timed sample."""
+    for _ in range(warmup):
+        case.run()
+
+    samples = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+
+        for _ in range(number):
+            case.run()
+
+        samples.append((time.perf_counter() - start) / number)
+
+    return samples
+
+
+def mann_whitney(before: list[float], after: list[float]) -> float:
+    """Return the p-value that samples after tend to be larger than before.
+
+    The U statistic is approximated by a normal distribution with a continuity
+    correction, which holds from about eight samples on each side.
+    """
+    ranked = sorted(itertools.chain(((x, 0) for x in before), ((x, 1) for x in after)))
+    rank_sum = 0.0
+    start = 0
+
+    while start < len(ranked):
+        end = start
+
+        while end < len(ranked) and ranked[end][0] == ranked[start][0]:
+            end += 1
+
+        # tied samples share the mean of the ranks they span
+        rank = (start + end + 1) / 2
+        rank_sum += rank * sum(side for _, side in ranked[start:end])
+        start = end
+
+    m, n = len(before), len(after)
+    u = rank_sum - n * (n + 1) / 2
+    deviation = math.sqrt(m * n * (m + n + 1) / 12)
+
+    if deviation == 0:
+        return 1.0
+
+    z = (u - m * n / 2 - 0.5) / deviation
+    return 1 - statistics.NormalDist().cdf(z)
+
+
+def compare(
+    before: dict[str, Any],
+    after: dict[str, Any],
+    alpha: float = DEFAULT_ALPHA,
+    min_change: float = DEFAULT_MIN_CHANGE,
+) -> list[Comparison]:
+    """Compare the median time of every case found in both result files."""
+    result = []
+
+    for name, new in after['cases'].items():
+        if name not in before['cases']:
+            continue
+
+        old_samples = before['cases'][name]['samples']
+        new_samples = new['samples']
+        old_median = statistics.median(old_samples)
+        new_median = statistics.median(new_samples)
+        change = new_median / old_median - 1
+        p_value = mann_whitney(old_samples, new_samples)
+        slower = p_value < alpha and change > min_change
+        result.append(Comparison(name, old_median, new_median, change, p_value, slower))
+
+    return result
+
+
+def run(args: argparse.Namespace) -> None:
+    results: dict[str, object] = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'warmup': args.warmup,
+        'repeats': args.repeats,
+    }
+    timings = {}
+
+    for case in cases():
+        if args.filter is not None and args.filter not in case.name:
+            continue
+
+        number = calibrate(case)
+        samples = measure(case, number, args.warmup, args.repeats)
+        median = statistics.median(samples)
+        timings[case.name] = {
+            'units': case.units,
+            'unit': case.unit,
+            'number': number,
+            'samples': samples,
+        }
+        print(
+            f'{case.name:>30}: {median * 1e3:10.2f}ms '
+            f'{case.units / median:12,.0f} {case.unit}/s'
+        )
+
+    results['cases'] = timings
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4)
+            file.write('\n')
+
+
+def run_compare(args: argparse.Namespace) -> None:
+    with open(args.before) as file:
+        before = json.load(file)
+
+    with open(args.after) as file:
+        after = json.load(file)
+
+    comparisons = compare(before, after, args.alpha, args.min_change)
+
+    for comparison in comparisons:
+        flag = 'SLOWER' if comparison.slower else ''
+        print(
+            f'{comparison.name:>30}: {comparison.before * 1e3:10.2f}ms '
+            f'-> {comparison.after * 1e3:10.2f}ms {comparison.change:+7.1%} '
+            f'p={comparison.p_value:.3f} {flag}'
+        )
+
+    slower = [comparison.name for comparison in comparisons if comparison.slower]
+
+    if slower:
+        sys.exit(f'Significant slowdown in {", ".join(slower)}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='time every case')
+    run_parser.add_argument('--output', help='JSON file to write the samples to')
+    run_parser.add_argument('--filter', help='only run cases whose name has this')
+    run_parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    run_parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('before')
+    compare_parser.add_argument('after')
+    compare_parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA)
+    compare_parser.add_argument('--min-change', type=float, default=DEFAULT_MIN_CHANGE)
+    compare_parser.set_defaults(func=run_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
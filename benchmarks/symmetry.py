@@ -0,0 +1,75 @@
+"""Measure transposition table hits with and without symmetric keys.
+
+Run with ``python -m benchmarks.symmetry [depth]``. Each phase searches a suite
+of positions with a fresh table, first keyed by the position as it stands and
+then by its canonical form among the eight board symmetries.
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from benchmarks.positions import random_positions
+from pythello.board import Board, Color
+from pythello.player import Negamax
+from pythello.player.negamax import TranspositionTable
+from pythello.score import Score
+
+DEFAULT_DEPTH = 5
+CACHE_MB = 16.0
+NUM_POSITIONS = 10
+PHASES = {'opening': (0, 2, 4), 'early midgame': (10, 14)}
+
+
+def suite(plies: tuple[int, ...]) -> list[tuple[Board, Color]]:
+    positions = []
+
+    for ply in plies:
+        if ply == 0:
+            positions.append((Board(), Color.BLACK))
+        else:
+            positions += random_positions(8, NUM_POSITIONS, ply)
+
+    return positions
+
+
+def run(
+    positions: list[tuple[Board, Color]], depth: int, symmetry: bool
+) -> list[float | None]:
+    search = Negamax(Score.BALANCED, depth, cache_mb=CACHE_MB, symmetry=symmetry)
+    nodes = 0
+    scores = []
+    start = time.perf_counter()
+
+    for board, player in positions:
+        move = search.search(board, player)
+
+        if not move & board.moves(player):
+            raise AssertionError(f'Illegal move {move} on {board.players}')
+
+        nodes += search.nodes
+        scores.append(search.score)
+
+    elapsed = time.perf_counter() - start
+
+    if not isinstance(search.cache, TranspositionTable):
+        raise TypeError('Expected a transposition table')
+
+    name = 'symmetric' if symmetry else 'plain'
+    print(
+        f'  {name:>9}: hit rate {search.cache.hit_rate:6.1%} '
+        f'nodes {nodes:9,d} time {elapsed:6.2f}s'
+    )
+    return scores
+
+
+if __name__ == '__main__':
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEPTH
+
+    for phase, plies in PHASES.items():
+        positions = suite(plies)
+        print(f'{phase} ({len(positions)} positions, depth {depth})')
+        plain = run(positions, depth, False)
+        symmetric = run(positions, depth, True)
+        same = sum(a == b for a, b in zip(plain, symmetric))
+        print(f'  {same}/{len(positions)} root scores identical')
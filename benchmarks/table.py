@@ -0,0 +1,57 @@
+"""Compare transposition table backends over a full self-play game.
+
+Run with ``python -m benchmarks.table [depth]``.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+import tracemalloc
+
+from pythello.board import Board
+from pythello.game import Game
+from pythello.player import Negamax
+from pythello.player.negamax import TranspositionTable
+from pythello.score import Score
+
+DEFAULT_DEPTH = 3
+CACHE_SIZE = 100_000
+CACHE_MB = 4.0
+SEED = 0
+REPORT_EVERY = 10
+
+
+def play(depth: int, **kwargs: float) -> None:
+    random.seed(SEED)
+    tracemalloc.start()
+    player = Negamax(Score.BALANCED, depth, **kwargs)  # type: ignore[arg-type]
+    game = Game(Board(), player, player)
+    start = time.perf_counter()
+
+    while not game.is_over:
+        game.move()
+
+        ply = len(game.score) - 1
+
+        if isinstance(player.cache, TranspositionTable) and ply % REPORT_EVERY == 0:
+            print(
+                f'  ply {ply:2d}: hit rate {player.cache.hit_rate:6.1%}'
+                f' occupancy {player.cache.occupancy:6.1%}'
+            )
+
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    name = type(player.cache).__name__
+    print(
+        f'{name}: {elapsed:.1f}s, {len(player.cache):,d} entries, '
+        f'{current / 2**20:.1f} MiB retained, {peak / 2**20:.1f} MiB peak'
+    )
+
+
+if __name__ == '__main__':
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEPTH
+    play(depth)
+    play(depth, cache_size=CACHE_SIZE)
+    play(depth, cache_mb=CACHE_MB)
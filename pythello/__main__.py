@@ -9,6 +9,7 @@ from pythello.app import App
 from pythello.board import Board
 from pythello.game import Game
 from pythello.player import AI
+from pythello.trace import MoveTrace
 
 app = True
 app_size = 600
@@ -28,7 +29,9 @@ if __name__ == '__main__':
     else:
         start_time = time.time()
         board = Board(game_size)
-        results = Game.series(board, player1, player2, games, verbose)
+        results = Game.series(
+            board, player1, player2, games, verbose, trace=MoveTrace()
+        )
 
         print({k: v for k, v in sorted(results.items(), key=lambda item: -item[1])})
         print(time.time() - start_time)
@@ -0,0 +1,332 @@
+"""Play many random or greedy games at once on NumPy bitboards.
+
+Every game of a batch is one ``uint64`` per color, so boards up to 8x8 fit, and
+all games advance in lockstep: move generation and flips are the same
+Kogge-Stone shifts as ``Board``, applied to whole arrays at once.
+"""
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+
+from pythello.board import Color
+from pythello.board.geometry import get_geometry
+from pythello.game import GameRecord
+from pythello.player import AI
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from pythello.board.geometry import Direction as BoardDirection
+
+    Bitboards = NDArray[np.uint64]
+    Direction = tuple[np.uint64, np.uint64, tuple[np.uint64, ...]]
+
+MAX_SIZE = 8
+ZERO = np.uint64(0)
+ONE = np.uint64(1)
+
+# SWAR population count constants
+M1 = np.uint64(0x5555555555555555)
+M2 = np.uint64(0x3333333333333333)
+M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+H01 = np.uint64(0x0101010101010101)
+
+
+class Ply(NamedTuple):
+    player: Color
+    moves: int
+    move: int
+
+
+class BatchGeometry(NamedTuple):
+    full_mask: np.uint64
+    corner_mask: np.uint64
+    edge_mask: np.uint64
+    interior_mask: np.uint64
+    right_directions: tuple[Direction, ...]
+    left_directions: tuple[Direction, ...]
+    squares: tuple[np.uint64, ...]
+
+
+@cache
+def batch_geometry(size: int) -> BatchGeometry:
+    """Convert the geometry of a board size to NumPy scalars."""
+    geometry = get_geometry(size)
+
+    def convert(directions: tuple[BoardDirection, ...]) -> tuple[Direction, ...]:
+        return tuple(
+            (np.uint64(bits), np.uint64(mask), tuple(np.uint64(s) for s in steps))
+            for bits, mask, steps in directions
+        )
+
+    return BatchGeometry(
+        full_mask=np.uint64(geometry.full_mask),
+        corner_mask=np.uint64(geometry.corner_mask),
+        edge_mask=np.uint64(geometry.edge_mask),
+        interior_mask=np.uint64(geometry.interior_mask),
+        right_directions=convert(geometry.right_directions),
+        left_directions=convert(geometry.left_directions),
+        squares=tuple(np.uint64(1 << i) for i in range(size**2)),
+    )
+
+
+def popcount(x: Bitboards) -> NDArray[np.int64]:
+    """Count the set bits of every bitboard."""
+    x = x - ((x >> ONE) & M1)
+    x = (x & M2) + ((x >> np.uint64(2)) & M2)
+    x = (x + (x >> np.uint64(4))) & M4
+    return ((x * H01) >> np.uint64(56)).astype(np.int64)
+
+
+def unpack(x: Bitboards) -> NDArray[np.bool_]:
+    """Split every bitboard into a row of 64 booleans, lowest bit first."""
+    octets = x.astype('<u8').view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(octets, axis=1, bitorder='little').astype(bool)
+
+
+class BatchGames:
+    """Games of one board size played together, a ply of every game per step.
+
+    A step costs a fixed number of NumPy calls, so a batch only beats
+    ``Game.series`` once it holds enough games to amortize them. On one core,
+    random games are faster from a few dozen games on, and games with a greedy
+    player only from about 200.
+    """
+
+    def __init__(self, num_games: int, size: int = MAX_SIZE) -> None:
+        if num_games <= 0:
+            raise ValueError('Number of games must be strictly positive')
+
+        if size <= 0 or size % 2 != 0 or size > MAX_SIZE:
+            raise ValueError(
+                f'Board size must be a positive even integer up to {MAX_SIZE}'
+            )
+
+        self.num_games = num_games
+        self.size = size
+        self._geometry = batch_geometry(size)
+        self.reset()
+
+    def captured(
+        self, current: Bitboards, opponent: Bitboards, move: Bitboards
+    ) -> Bitboards:
+        """Return the move and the pieces it flips, or nothing for empty moves."""
+        captured = move.copy()
+
+        for bits, mask, steps in self._geometry.right_directions:
+            pro = opponent & mask
+            x = pro & (move >> bits)
+
+            for step in steps:
+                x = x | (pro & (x >> step))
+                pro = pro & (pro >> step)
+
+            captured |= np.where((x >> bits) & current & mask, x, ZERO)
+
+        for bits, mask, steps in self._geometry.left_directions:
+            pro = opponent & mask
+            x = pro & (move << bits)
+
+            for step in steps:
+                x = x | (pro & (x << step))
+                pro = pro & (pro << step)
+
+            captured |= np.where((x << bits) & current & mask, x, ZERO)
+
+        return np.where(move != ZERO, captured, ZERO)
+
+    @property
+    def current(self) -> tuple[Bitboards, Bitboards]:
+        """Return the pieces of the players to move and of their opponents."""
+        white = self.player == Color.WHITE
+        current = np.where(white, self.white, self.black)
+        opponent = np.where(white, self.black, self.white)
+        return current, opponent
+
+    def features(self, current: Bitboards, opponent: Bitboards) -> NDArray[np.int64]:
+        """Count the evaluation features of both players in every position.
+
+        Each row is laid out like ``Board.features``: the counts of the player
+        to move indexed by ``Feature``, followed by those of the opponent.
+        """
+        geometry = self._geometry
+        empty = (current | opponent) ^ geometry.full_mask
+        near_empty = np.zeros_like(current)
+
+        for bits, mask, _ in geometry.right_directions:
+            near_empty |= (empty >> bits) & mask
+
+        for bits, mask, _ in geometry.left_directions:
+            near_empty |= (empty << bits) & mask
+
+        frontier = near_empty & ~geometry.corner_mask
+        counts = []
+
+        for player, other in ((current, opponent), (opponent, current)):
+            counts += [
+                popcount(player & geometry.corner_mask),
+                popcount(player & geometry.edge_mask),
+                popcount(player & geometry.interior_mask),
+                popcount(player & frontier),
+                popcount(self.moves(player, other)),
+            ]
+
+        return np.stack(counts, axis=1)
+
+    def greedy(
+        self, current: Bitboards, opponent: Bitboards, moves: Bitboards
+    ) -> NDArray[np.bool_]:
+        """Return the moves flipping the most pieces in each game."""
+        flipped = np.full((len(moves), 64), -1, dtype=np.int64)
+
+        for index, square in enumerate(self._geometry.squares):
+            legal = (moves & square) != ZERO
+
+            if legal.any():
+                move = np.where(legal, square, ZERO)
+                count = popcount(self.captured(current, opponent, move))
+                flipped[:, index] = np.where(legal, count, -1)
+
+        best: NDArray[np.bool_] = flipped == flipped.max(axis=1, keepdims=True)
+        return best
+
+    def history(self, index: int) -> list[Ply]:
+        """Return the plies of one game, with the valid moves at each of them."""
+        return [
+            Ply(Color(int(player[index])), int(moves[index]), int(move[index]))
+            for player, moves, move in self._history
+            if move[index]
+        ]
+
+    def moves(self, current: Bitboards, opponent: Bitboards) -> Bitboards:
+        """Return a bitboard of valid moves for every game."""
+        empty = (current | opponent) ^ self._geometry.full_mask
+        moves = np.zeros_like(current)
+
+        for bits, mask, steps in self._geometry.right_directions:
+            pro = opponent & mask
+            x = pro & (current >> bits)
+
+            for step in steps:
+                x = x | (pro & (x >> step))
+                pro = pro & (pro >> step)
+
+            moves |= (x >> bits) & empty & mask
+
+        for bits, mask, steps in self._geometry.left_directions:
+            pro = opponent & mask
+            x = pro & (current << bits)
+
+            for step in steps:
+                x = x | (pro & (x << step))
+                pro = pro & (pro << step)
+
+            moves |= (x << bits) & empty & mask
+
+        return moves
+
+    def play(
+        self, player1: AI, player2: AI, seed: int | None = None
+    ) -> list[GameRecord]:
+        """Play every game of the batch to the end and return their records."""
+        for player in (player1, player2):
+            if player not in (AI.RANDOM, AI.GREEDY):
+                raise ValueError(f'Batched games cannot play {player}')
+
+        rng = np.random.default_rng(seed)
+        greedy = (player1 is AI.GREEDY, player2 is AI.GREEDY)
+        self.reset()
+
+        while self.step(greedy, rng):
+            pass
+
+        return self.records()
+
+    def records(self) -> list[GameRecord]:
+        """Return the record of every game, with no winner for unfinished ones."""
+        black = popcount(self.black)
+        white = popcount(self.white)
+        records = []
+
+        for index in range(self.num_games):
+            winner = None
+
+            if self.done[index] and black[index] != white[index]:
+                winner = Color.BLACK if black[index] > white[index] else Color.WHITE
+
+            score = (int(black[index]), int(white[index]))
+            records.append(GameRecord(index, winner, score, int(self.turns[index])))
+
+        return records
+
+    def reset(self) -> None:
+        """Reset every game to the initial position."""
+        size = self.size
+        mid = size**2 // 2
+        size_2 = size // 2
+        black = (1 << (mid - size_2)) | (1 << (mid + size_2 - 1))
+        white = (1 << (mid - size_2 - 1)) | (1 << (mid + size_2))
+
+        self.black = np.full(self.num_games, black, dtype=np.uint64)
+        self.white = np.full(self.num_games, white, dtype=np.uint64)
+        self.player = np.full(self.num_games, Color.BLACK, dtype=np.uint8)
+        self.done = np.zeros(self.num_games, dtype=bool)
+        self.turns = np.zeros(self.num_games, dtype=np.int64)
+        self._history: list[tuple[NDArray[np.uint8], Bitboards, Bitboards]] = []
+
+    def step(self, greedy: tuple[bool, bool], rng: np.random.Generator) -> bool:
+        """Play one move in every unfinished game, passing where needed.
+
+        Return whether any game is still being played.
+        """
+        current, opponent = self.current
+        moves = self.moves(current, opponent)
+        stuck = (moves == ZERO) & ~self.done
+
+        if stuck.any():
+            # players without a move pass, and the game ends if both are stuck
+            replies = self.moves(opponent, current)
+            self.done |= stuck & (replies == ZERO)
+            passing = stuck & ~self.done
+            self.player[passing] ^= 1
+            current, opponent = self.current
+            moves = np.where(passing, replies, moves)
+
+        active = ~self.done
+
+        if not active.any():
+            return False
+
+        candidates = unpack(moves)
+
+        for color, is_greedy in zip(Color, greedy):
+            if not is_greedy:
+                continue
+
+            playing = np.flatnonzero(active & (self.player == color))
+
+            if len(playing):
+                candidates[playing] = self.greedy(
+                    current[playing], opponent[playing], moves[playing]
+                )
+
+        # pick uniformly among the candidates of each game, lowest square first
+        count = candidates.sum(axis=1)
+        choice = (rng.random(self.num_games) * count).astype(np.int64)
+        square = (candidates.cumsum(axis=1) > choice[:, None]).argmax(axis=1)
+        move = np.where(active, ONE << square.astype(np.uint64), ZERO)
+
+        captured = self.captured(current, opponent, move)
+        current = current | captured
+        opponent = opponent & ~captured
+        white = self.player == Color.WHITE
+        self.black = np.where(white, opponent, current)
+        self.white = np.where(white, current, opponent)
+
+        self._history.append((self.player.copy(), moves, move))
+        self.turns += active
+        self.player[active] ^= 1
+        return True
@@ -1,12 +1,25 @@
 from .board import Board
 from .color import Color
-from .position import Position, PositionSet, position_to_coordinates, split_position
+from .feature import NUM_FEATURES, Feature
+from .position import (
+    Position,
+    PositionSet,
+    iterate_position,
+    position_to_coordinates,
+    split_position,
+)
+from .symmetry import inverse_transform, transform
 
 __all__ = [
     'Board',
     'Color',
+    'Feature',
+    'NUM_FEATURES',
     'Position',
     'PositionSet',
+    'inverse_transform',
+    'iterate_position',
     'position_to_coordinates',
     'split_position',
+    'transform',
 ]
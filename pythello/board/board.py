@@ -1,62 +1,29 @@
 from __future__ import annotations
 
-from operator import lshift, rshift
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING
 
-from pythello.board import mask as board_mask
+from pythello.board import symmetry
 from pythello.board.color import Color
+from pythello.board.geometry import CHUNK_BITS, CHUNK_MASK, get_geometry, zobrist_hash
 from pythello.board.position import split_position
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
-
+    from pythello.board.geometry import Geometry
     from pythello.board.position import Position, PositionSet
 
 DEFAULT_SIZE = 8
 
 
-class Shift(NamedTuple):
-    operator: Callable[[int, int], int]
-    bits: int
-
-
 class Board:
+    __slots__ = ('_geometry', '_hash', 'players')
+
     def __init__(self, size: int = DEFAULT_SIZE) -> None:
         if size <= 0 or size % 2 != 0:
             raise ValueError('Board size must be a positive even integer')
 
-        self._size = size
+        self._geometry: Geometry = get_geometry(size)
         self.players: list[int] = []
-
-        right_mask = board_mask.right_mask(size)
-        left_mask = board_mask.left_mask(size)
-        self._corner_mask = board_mask.corner_mask(size)
-        self._edge_mask = board_mask.edge_mask(size, remove_corners=True)
-        self._full_mask = board_mask.full_mask(size)
-        self._interior_mask = board_mask.interior_mask(size)
-
-        self._masks = (
-            right_mask,  # right
-            right_mask >> size,  # down + right
-            self._full_mask,  # down
-            left_mask >> size,  # down + left
-            left_mask,  # left
-            (left_mask << size) & self._full_mask,  # up + left
-            self._full_mask,  # up
-            (right_mask << size) & self._full_mask,  # up + right
-        )
-
-        self._shifts = (
-            Shift(rshift, 1),  # right
-            Shift(rshift, size + 1),  # down + right
-            Shift(rshift, size),  # down
-            Shift(rshift, size - 1),  # down + left
-            Shift(lshift, 1),  # left
-            Shift(lshift, size + 1),  # up + left
-            Shift(lshift, size),  # up
-            Shift(lshift, size - 1),  # up + right
-        )
-
+        self._hash = 0
         self.reset()
 
     def __eq__(self, other: object) -> bool:
@@ -67,51 +34,257 @@ class Board:
 
     def __hash__(self) -> int:
         """Get board hash code"""
-        return hash(tuple(self.players))
+        return self._hash
+
+    def __reduce__(self) -> tuple[object, tuple[int, int, int]]:
+        black, white = self.players
+        return Board.from_players, (black, white, self._geometry.size)
 
     def _captured(self, player: Color, move: Position) -> tuple[int, int, int]:
         current = self.players[player]
         opponent = self.players[player.opponent]
         captured = move
 
-        for shift, mask in zip(self._shifts, self._masks):
-            current_mask = mask & current
-            opponent_mask = mask & opponent
-            x = shift.operator(move, shift.bits) & opponent_mask
+        for bits, mask, steps in self._geometry.right_directions:
+            x = pro = opponent & mask
+            x &= move >> bits
 
-            for _ in range(self._size - 3):
-                x |= shift.operator(x, shift.bits) & opponent_mask
+            for step in steps:
+                x |= pro & (x >> step)
+                pro &= pro >> step
 
-            if (shift.operator(x, shift.bits) & current_mask) != 0:
+            if (x >> bits) & current & mask:
+                captured |= x
+
+        for bits, mask, steps in self._geometry.left_directions:
+            x = pro = opponent & mask
+            x &= move << bits
+
+            for step in steps:
+                x |= pro & (x << step)
+                pro &= pro << step
+
+            if (x << bits) & current & mask:
                 captured |= x
 
         current |= captured
         opponent &= ~captured
         return current, opponent, captured
 
+    def _flip_hash(self, flips: Position) -> int:
+        zobrist_flips = self._geometry.zobrist_flips
+        flip_hash = 0
+
+        while flips:
+            bit = flips & -flips
+            flip_hash ^= zobrist_flips[bit.bit_length() - 1]
+            flips ^= bit
+
+        return flip_hash
+
+    def _rehash(self) -> None:
+        self._hash = zobrist_hash(self._geometry, *self.players)
+
+    def apply(self, move: Position, player: Color) -> Position:
+        """Place a piece in place and return the flipped pieces for undo."""
+        current, opponent, captured = self._captured(player, move)
+        flips = captured ^ move
+        self.players[player] = current
+        self.players[player.opponent] = opponent
+        piece_hash = self._geometry.zobrist_pieces[player][move.bit_length() - 1]
+        self._hash ^= piece_hash ^ self._flip_hash(flips)
+        return flips
+
+    def canonical(self) -> tuple[Board, int]:
+        """Return the canonical copy of the board among its eight symmetries.
+
+        The second value is the transform from this board to the canonical one.
+        """
+        black, white = self.players
+        black, white, index = symmetry.canonical(black, white, self.size)
+        return Board.from_players(black, white, self.size), index
+
+    def canonical_zobrist(self, player: Color) -> tuple[int, int, int, int]:
+        """Return the Zobrist hash of the canonical board with the side to move.
+
+        The canonical bitboards of both players and the transform to them follow.
+        """
+        black, white = self.players
+        black, white, index = symmetry.canonical(black, white, self.size)
+        key = zobrist_hash(self._geometry, black, white)
+        return key ^ self._geometry.zobrist_side[player], black, white, index
+
     def captured(self, player: Color, move: Position) -> PositionSet:
         """Get all pieces captured for the given move by the specified player."""
         _, _, captured = self._captured(player, move)
         return split_position(captured)
 
     def copy(self) -> Board:
-        board = Board(self._size)
+        board = Board.__new__(Board)
+        board._geometry = self._geometry
+        board._hash = self._hash
         board.players = self.players.copy()
         return board
 
+    @classmethod
+    def from_players(cls, black: int, white: int, size: int = DEFAULT_SIZE) -> Board:
+        """Create a board from the bitboards of both players."""
+        board = cls(size)
+        board.players = [black, white]
+        board._rehash()
+        return board
+
+    @property
+    def empty(self) -> int:
+        return self.filled ^ self._geometry.full_mask
+
     @property
     def filled(self) -> int:
         return self.players[Color.BLACK] | self.players[Color.WHITE]
 
+    def features(self, player: Color) -> tuple[int, ...]:
+        """Count every evaluation feature of both players in a single pass.
+
+        The counts are indexed by ``Feature``, the player's first and the
+        opponent's after them, and agree with the matching ``player_*`` methods
+        and ``num_moves``.
+        """
+        geometry = self._geometry
+        current = self.players[player]
+        opponent = self.players[player.opponent]
+        empty = (current | opponent) ^ geometry.full_mask
+        near_empty = 0
+        current_moves = opponent_moves = 0
+
+        # flood both players' lines at once, collecting the squares next to an
+        # empty square on the way
+        for bits, mask, steps in geometry.right_directions:
+            near_empty |= (empty >> bits) & mask
+            x = pro = opponent & mask
+            y = own = current & mask
+            x &= current >> bits
+            y &= opponent >> bits
+
+            for step in steps:
+                x |= pro & (x >> step)
+                pro &= pro >> step
+                y |= own & (y >> step)
+                own &= own >> step
+
+            current_moves |= (x >> bits) & empty & mask
+            opponent_moves |= (y >> bits) & empty & mask
+
+        for bits, mask, steps in geometry.left_directions:
+            near_empty |= (empty << bits) & mask
+            x = pro = opponent & mask
+            y = own = current & mask
+            x &= current << bits
+            y &= opponent << bits
+
+            for step in steps:
+                x |= pro & (x << step)
+                pro &= pro << step
+                y |= own & (y << step)
+                own &= own << step
+
+            current_moves |= (x << bits) & empty & mask
+            opponent_moves |= (y << bits) & empty & mask
+
+        frontier = near_empty & ~geometry.corner_mask
+        return (
+            (current & geometry.corner_mask).bit_count(),
+            (current & geometry.edge_mask).bit_count(),
+            (current & geometry.interior_mask).bit_count(),
+            (current & frontier).bit_count(),
+            current_moves.bit_count(),
+            (opponent & geometry.corner_mask).bit_count(),
+            (opponent & geometry.edge_mask).bit_count(),
+            (opponent & geometry.interior_mask).bit_count(),
+            (opponent & frontier).bit_count(),
+            opponent_moves.bit_count(),
+        )
+
+    def flips(self, player: Color, move: Position) -> Position:
+        """Return a bitboard of opponent pieces flipped by the given move."""
+        _, _, captured = self._captured(player, move)
+        return captured ^ move
+
+    def has_moves(self, player: Color) -> bool:
+        """Check if the specified player has a valid move.
+
+        Directions are searched one at a time, stopping at the first move found,
+        which is much cheaper than ``moves`` for positions that are not passes.
+        """
+        current = self.players[player]
+        opponent = self.players[player.opponent]
+        empty = (current | opponent) ^ self._geometry.full_mask
+
+        for bits, mask, steps in self._geometry.right_directions:
+            x = pro = opponent & mask
+            x &= current >> bits
+
+            for step in steps:
+                x |= pro & (x >> step)
+                pro &= pro >> step
+
+            if (x >> bits) & empty & mask:
+                return True
+
+        for bits, mask, steps in self._geometry.left_directions:
+            x = pro = opponent & mask
+            x &= current << bits
+
+            for step in steps:
+                x |= pro & (x << step)
+                pro &= pro << step
+
+            if (x << bits) & empty & mask:
+                return True
+
+        return False
+
     @property
     def is_full(self) -> bool:
         """Check if the board is full."""
-        return self.filled == self._full_mask
+        return self.filled == self._geometry.full_mask
+
+    def moves(self, player: Color) -> Position:
+        """Return a bitboard of valid moves for the specified player."""
+        current = self.players[player]
+        opponent = self.players[player.opponent]
+        empty = (current | opponent) ^ self._geometry.full_mask
+        moves = 0
+
+        for bits, mask, steps in self._geometry.right_directions:
+            x = pro = opponent & mask
+            x &= current >> bits
+
+            for step in steps:
+                x |= pro & (x >> step)
+                pro &= pro >> step
+
+            moves |= (x >> bits) & empty & mask
+
+        for bits, mask, steps in self._geometry.left_directions:
+            x = pro = opponent & mask
+            x &= current << bits
+
+            for step in steps:
+                x |= pro & (x << step)
+                pro &= pro << step
+
+            moves |= (x << bits) & empty & mask
+
+        return moves
 
     @property
     def num_empty(self) -> int:
         """Return the number of empty spaces on the board."""
-        return (self.filled ^ self._full_mask).bit_count()
+        return (self.filled ^ self._geometry.full_mask).bit_count()
+
+    def num_moves(self, player: Color) -> int:
+        """Return the number of valid moves for the specified player."""
+        return self.moves(player).bit_count()
 
     def peek(self, move: Position, player: Color) -> Board:
         board = self.copy()
@@ -120,31 +293,35 @@ class Board:
 
     def place_piece(self, piece: Position, player: Color) -> None:
         """Place a piece on the board for the specified player."""
-        current, opponent, _ = self._captured(player, piece)
-        self.players[player] = current
-        self.players[player.opponent] = opponent
+        self.apply(piece, player)
 
     def player_corners(self, player: Color) -> int:
-        return (self.players[player] & self._corner_mask).bit_count()
+        return (self.players[player] & self._geometry.corner_mask).bit_count()
 
     def player_edges(self, player: Color) -> int:
-        return (self.players[player] & self._edge_mask).bit_count()
+        return (self.players[player] & self._geometry.edge_mask).bit_count()
 
     def player_frontier(self, player: Color) -> int:
         current = self.players[player]
         opponent = self.players[player.opponent]
-        empty = (current | opponent) ^ self._full_mask
+        empty = (current | opponent) ^ self._geometry.full_mask
         frontier = 0
 
-        for shift, mask in zip(self._shifts, self._masks):
-            x = shift.operator(empty, shift.bits) & mask
-            frontier |= x & current
+        for bits, mask, _ in self._geometry.right_directions:
+            frontier |= (empty >> bits) & mask
+
+        for bits, mask, _ in self._geometry.left_directions:
+            frontier |= (empty << bits) & mask
 
-        frontier &= ~self._corner_mask
+        frontier &= current & ~self._geometry.corner_mask
         return frontier.bit_count()
 
     def player_interior(self, player: Color) -> int:
-        return (self.players[player] & self._interior_mask).bit_count()
+        return (self.players[player] & self._geometry.interior_mask).bit_count()
+
+    def player_stable(self, player: Color) -> int:
+        """Return the number of the player's discs that can never be flipped."""
+        return self.stable(player).bit_count()
 
     def player_pieces(self, player: Color) -> PositionSet:
         """Get all pieces on the board for the specified player."""
@@ -156,14 +333,16 @@ class Board:
 
     def reset(self) -> None:
         """Reset the board to its initial state."""
-        mid = self._size**2 // 2
-        size_2 = self._size // 2
+        size = self._geometry.size
+        mid = size**2 // 2
+        size_2 = size // 2
 
         self.players = [0, 0]
         self.players[Color.BLACK] |= 1 << (mid - size_2)
         self.players[Color.BLACK] |= 1 << (mid + size_2 - 1)
         self.players[Color.WHITE] |= 1 << (mid - size_2 - 1)
         self.players[Color.WHITE] |= 1 << (mid + size_2)
+        self._rehash()
 
     def score(self, player: Color = Color.BLACK) -> int:
         """Return the current score of the game."""
@@ -171,23 +350,67 @@ class Board:
 
     @property
     def size(self) -> int:
-        return self._size
+        return self._geometry.size
 
-    def valid_moves(self, player: Color) -> PositionSet:
-        """Return the set of valid moves for the specified player."""
+    def stable(self, player: Color) -> Position:
+        """Return a bitboard of the player's discs that can never be flipped.
+
+        A disc is stable when, along each of the four axes, its line is full or
+        it sits next to the board's edge or another stable disc of its color.
+        The result is a lower bound: some stable discs are not found.
+        """
+        geometry = self._geometry
         current = self.players[player]
-        opponent = self.players[player.opponent]
-        empty = (current | opponent) ^ self._full_mask
-        moves = 0
+        size = geometry.size**2
+        empty = self.filled ^ geometry.full_mask
+        open_lines = 0
+
+        # every line through an empty square can still change, looked up a byte
+        # of empty squares at a time for all four axes at once
+        for chunk in geometry.line_chunks:
+            if not empty:
+                break
+
+            open_lines |= chunk[empty & CHUNK_MASK]
+            empty >>= CHUNK_BITS
 
-        for shift, mask in zip(self._shifts, self._masks):
-            opponent_mask = mask & opponent
-            empty_mask = mask & empty
-            x = shift.operator(current, shift.bits) & opponent_mask
+        axes = []
 
-            for _ in range(self._size - 3):
-                x |= shift.operator(x, shift.bits) & opponent_mask
+        for index, (bits, right, left, border) in enumerate(geometry.axes):
+            open_axis = open_lines >> (index * size) & geometry.full_mask
+            axes.append((bits, right, left, border | open_axis ^ geometry.full_mask))
 
-            moves |= shift.operator(x, shift.bits) & empty_mask
+        stable = 0
 
-        return split_position(moves)
+        while True:
+            grown = current
+
+            for bits, right, left, anchored in axes:
+                grown &= anchored | (stable >> bits) & right | (stable << bits) & left
+
+            if grown == stable:
+                return stable
+
+            stable = grown
+
+    def transform(self, index: int) -> Board:
+        """Return a copy of the board under one of its eight symmetries."""
+        black, white = (
+            symmetry.transform(pieces, self.size, index) for pieces in self.players
+        )
+        return Board.from_players(black, white, self.size)
+
+    def undo(self, move: Position, flips: Position, player: Color) -> None:
+        """Reverse a move made with apply given the flips it returned."""
+        self.players[player] ^= flips | move
+        self.players[player.opponent] |= flips
+        piece_hash = self._geometry.zobrist_pieces[player][move.bit_length() - 1]
+        self._hash ^= piece_hash ^ self._flip_hash(flips)
+
+    def zobrist(self, player: Color) -> int:
+        """Return the 64-bit Zobrist hash of the board with the side to move."""
+        return self._hash ^ self._geometry.zobrist_side[player]
+
+    def valid_moves(self, player: Color) -> PositionSet:
+        """Return the set of valid moves for the specified player."""
+        return split_position(self.moves(player))
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from enum import IntEnum
+
+
+class Feature(IntEnum):
+    """Index of each count in the vector returned by ``Board.features``.
+
+    The vector holds every feature of the player followed by every feature of
+    the opponent, so the opponent's count of a feature is at ``feature +
+    NUM_FEATURES``.
+    """
+
+    CORNERS = 0
+    EDGES = 1
+    INTERIOR = 2
+    FRONTIER = 3
+    MOBILITY = 4
+
+
+NUM_FEATURES = len(Feature)
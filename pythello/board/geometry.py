@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from functools import cache
+from operator import or_, xor
+from typing import NamedTuple
+
+from pythello.board import mask as board_mask
+
+Axis = tuple[int, int, int, int]
+Direction = tuple[int, int, tuple[int, ...]]
+Chunks = tuple[tuple[int, ...], ...]
+
+CHUNK_BITS = 8
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+
+class Geometry(NamedTuple):
+    """Masks and shift directions shared by every board of the same size."""
+
+    size: int
+    full_mask: int
+    corner_mask: int
+    edge_mask: int
+    interior_mask: int
+    right_directions: tuple[Direction, ...]
+    left_directions: tuple[Direction, ...]
+    axes: tuple[Axis, ...]
+    line_chunks: Chunks
+    zobrist_pieces: tuple[tuple[int, ...], tuple[int, ...]]
+    zobrist_flips: tuple[int, ...]
+    zobrist_side: tuple[int, int]
+    zobrist_chunks: tuple[Chunks, Chunks]
+
+
+def row_line(row: int, col: int) -> int:
+    return row
+
+
+def diagonal_line(row: int, col: int) -> int:
+    return col - row
+
+
+def column_line(row: int, col: int) -> int:
+    return col
+
+
+def antidiagonal_line(row: int, col: int) -> int:
+    return col + row
+
+
+def line_masks(size: int) -> tuple[int, ...]:
+    """Return the four lines through every square packed into one integer.
+
+    The mask of each axis is shifted up by its index times the number of
+    squares, with axes ordered like the directions: rows, diagonals running
+    down and to the right, columns, then diagonals running down and to the left.
+    """
+    keys = (row_line, diagonal_line, column_line, antidiagonal_line)
+    squares = [(row, col) for row in range(size) for col in range(size)]
+    result = [0] * size**2
+
+    for axis, key in enumerate(keys):
+        lines: dict[int, int] = {}
+
+        for index, (row, col) in enumerate(squares):
+            line = key(row, col)
+            lines[line] = lines.get(line, 0) | 1 << index
+
+        for index, (row, col) in enumerate(squares):
+            result[index] |= lines[key(row, col)] << (axis * size**2)
+
+    return tuple(result)
+
+
+def chunk_keys(
+    keys: tuple[int, ...], combine: Callable[[int, int], int] = xor
+) -> Chunks:
+    """Combine per-square keys into tables indexed by a byte of the bitboard."""
+    chunks = []
+
+    for start in range(0, len(keys), CHUNK_BITS):
+        chunk = [0]
+
+        for key in keys[start : start + CHUNK_BITS]:
+            chunk += [combine(value, key) for value in chunk]
+
+        chunks.append(tuple(chunk))
+
+    return tuple(chunks)
+
+
+@cache
+def get_geometry(size: int) -> Geometry:
+    """Build the geometry for a board size, computing it only once per size."""
+    right_mask = board_mask.right_mask(size)
+    left_mask = board_mask.left_mask(size)
+    full_mask = board_mask.full_mask(size)
+
+    masks = (
+        right_mask,  # right
+        right_mask >> size,  # down + right
+        full_mask,  # down
+        left_mask >> size,  # down + left
+        left_mask,  # left
+        (left_mask << size) & full_mask,  # up + left
+        full_mask,  # up
+        (right_mask << size) & full_mask,  # up + right
+    )
+
+    # Kogge-Stone fills double the shift distance each step, so a run of up to
+    # size - 2 opponent pieces is covered in ceil(log2(size - 2)) steps
+    num_steps = max(size - 3, 0).bit_length()
+    bits = (1, size + 1, size, size - 1)
+    directions = tuple(
+        (b, mask, tuple(b << i for i in range(num_steps)))
+        for b, mask in zip(bits + bits, masks)
+    )
+
+    # stability treats the end of a line like a stable disc, so each axis also
+    # keeps the squares missing a neighbor along it
+    axes = []
+
+    for (b, right, _), (_, left, _) in zip(directions[:4], directions[4:]):
+        inner = (full_mask >> b) & right & (full_mask << b) & left
+        axes.append((b, right, left, full_mask ^ inner))
+
+    # Zobrist keys are seeded by size so hashes agree across processes and runs
+    rng = random.Random(size)
+    black = tuple(rng.getrandbits(64) for _ in range(size**2))
+    white = tuple(rng.getrandbits(64) for _ in range(size**2))
+
+    return Geometry(
+        size=size,
+        full_mask=full_mask,
+        corner_mask=board_mask.corner_mask(size),
+        edge_mask=board_mask.edge_mask(size, remove_corners=True),
+        interior_mask=board_mask.interior_mask(size),
+        right_directions=directions[:4],
+        left_directions=directions[4:],
+        axes=tuple(axes),
+        line_chunks=chunk_keys(line_masks(size), or_),
+        zobrist_pieces=(black, white),
+        zobrist_flips=tuple(b ^ w for b, w in zip(black, white)),
+        zobrist_side=(0, rng.getrandbits(64)),
+        zobrist_chunks=(chunk_keys(black), chunk_keys(white)),
+    )
+
+
+def zobrist_hash(geometry: Geometry, black: int, white: int) -> int:
+    """Hash the bitboards of both players a byte at a time."""
+    result = 0
+
+    for pieces, chunks in zip((black, white), geometry.zobrist_chunks):
+        for chunk in chunks:
+            if not pieces:
+                break
+
+            result ^= chunk[pieces & CHUNK_MASK]
+            pieces >>= CHUNK_BITS
+
+    return result
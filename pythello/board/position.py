@@ -1,9 +1,22 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 Position = int
 PositionSet = set[Position]
 
 
+def iterate_position(position: Position) -> Iterator[Position]:
+    """Yield each set bit of a bitboard as a single-bit position, lowest first."""
+    while position:
+        bit = position & -position
+        yield bit
+        position ^= bit
+
+
 def position_to_coordinates(position: Position, size: int) -> tuple[int, int]:
     index = f'{position:b}'[::-1].find('1')
     return index // size, index % size
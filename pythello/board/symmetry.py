@@ -0,0 +1,148 @@
+"""Dihedral symmetries of square bitboards.
+
+Transforms are numbered 0 to 7: bit 2 transposes the board first, then bit 0
+mirrors it left to right and bit 1 flips it top to bottom.
+"""
+from __future__ import annotations
+
+from functools import cache
+from typing import NamedTuple
+
+NUM_TRANSFORMS = 8
+HORIZONTAL = 1
+VERTICAL = 2
+DIAGONAL = 4
+ROTATE = DIAGONAL | HORIZONTAL  # a quarter turn clockwise
+
+
+class Symmetry(NamedTuple):
+    """Masks and shifts swapping mirrored columns, rows and diagonals."""
+
+    columns: tuple[tuple[int, int, int], ...]
+    rows: tuple[tuple[int, int, int], ...]
+    diagonal: int
+    above: tuple[tuple[int, int], ...]
+    below: tuple[tuple[int, int], ...]
+
+
+@cache
+def get_symmetry(size: int) -> Symmetry:
+    """Build the masks for the symmetries of a board size, once per size."""
+    column = sum(1 << (row * size) for row in range(size))
+    row = (1 << size) - 1
+    columns = []
+    rows = []
+
+    for i in range(size // 2):
+        j = size - 1 - i
+        columns.append((column << i, column << j, j - i))
+        rows.append((row << (i * size), row << (j * size), (j - i) * size))
+
+    # squares right of the main diagonal move down to their transpose and
+    # squares left of it move up, by a multiple of size - 1 bits
+    above = []
+    below = []
+
+    for k in range(1, size):
+        mask = sum(1 << (r * size + r + k) for r in range(size - k))
+        above.append((mask, k * (size - 1)))
+        below.append((mask << (k * (size - 1)), k * (size - 1)))
+
+    return Symmetry(
+        columns=tuple(columns),
+        rows=tuple(rows),
+        diagonal=sum(1 << (i * size + i) for i in range(size)),
+        above=tuple(above),
+        below=tuple(below),
+    )
+
+
+def canonical(black: int, white: int, size: int) -> tuple[int, int, int]:
+    """Return the smallest symmetric copy of a position and the transform to it."""
+    best = (black, white, 0)
+    pairs = zip(variants(black, size), variants(white, size))
+
+    for index, pair in enumerate(pairs):
+        if pair < best[:2]:
+            best = (*pair, index)
+
+    return best
+
+
+def flip_diagonal(bits: int, size: int) -> int:
+    """Mirror a bitboard along the diagonal through the first square."""
+    symmetry = get_symmetry(size)
+    result = bits & symmetry.diagonal
+
+    for mask, shift in symmetry.above:
+        result |= (bits & mask) << shift
+
+    for mask, shift in symmetry.below:
+        result |= (bits & mask) >> shift
+
+    return result
+
+
+def flip_horizontal(bits: int, size: int) -> int:
+    """Mirror a bitboard left to right."""
+    result = 0
+
+    for left, right, shift in get_symmetry(size).columns:
+        result |= ((bits & left) << shift) | ((bits & right) >> shift)
+
+    return result
+
+
+def flip_vertical(bits: int, size: int) -> int:
+    """Mirror a bitboard top to bottom."""
+    result = 0
+
+    for top, bottom, shift in get_symmetry(size).rows:
+        result |= ((bits & top) << shift) | ((bits & bottom) >> shift)
+
+    return result
+
+
+def inverse_transform(bits: int, size: int, index: int) -> int:
+    """Undo a numbered transform, mapping canonical squares back to the board."""
+    if index & VERTICAL:
+        bits = flip_vertical(bits, size)
+
+    if index & HORIZONTAL:
+        bits = flip_horizontal(bits, size)
+
+    if index & DIAGONAL:
+        bits = flip_diagonal(bits, size)
+
+    return bits
+
+
+def transform(bits: int, size: int, index: int) -> int:
+    """Apply a numbered transform to a bitboard."""
+    if index & DIAGONAL:
+        bits = flip_diagonal(bits, size)
+
+    if index & HORIZONTAL:
+        bits = flip_horizontal(bits, size)
+
+    if index & VERTICAL:
+        bits = flip_vertical(bits, size)
+
+    return bits
+
+
+def variants(bits: int, size: int) -> tuple[int, ...]:
+    """Return all eight transforms of a bitboard, indexed by transform number."""
+    horizontal = flip_horizontal(bits, size)
+    diagonal = flip_diagonal(bits, size)
+    diagonal_horizontal = flip_horizontal(diagonal, size)
+    return (
+        bits,
+        horizontal,
+        flip_vertical(bits, size),
+        flip_vertical(horizontal, size),
+        diagonal,
+        diagonal_horizontal,
+        flip_vertical(diagonal, size),
+        flip_vertical(diagonal_horizontal, size),
+    )
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import random
+import time
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from enum import Enum
 from typing import TYPE_CHECKING, NamedTuple
 
-from pythello.board import Color
+from pythello.board import Board, Color, split_position
+from pythello.trace import MoveRecord, MoveTrace
 
 if TYPE_CHECKING:
-    from pythello.board import Board, Position, PositionSet
+    from collections.abc import Iterator
+
+    from pythello.board import Position, PositionSet
     from pythello.player import Player
+    from pythello.trace import Tracer
 
 
 class AssignedPlayer(NamedTuple):
@@ -19,12 +26,54 @@ class AssignedPlayer(NamedTuple):
         return f'{self.player} ({self.color.name.lower()})'
 
 
+class GameRecord(NamedTuple):
+    game: int
+    winner: Color | None
+    score: tuple[int, int]
+    turns: int
+    moves: tuple[MoveRecord, ...] = ()
+
+
 class Result(Enum):
     WIN = 1
     LOSS = 2
     DRAW = 3
 
 
+def play_game(
+    size: int,
+    player1: Player,
+    player2: Player,
+    index: int,
+    seed: int | None,
+    trace: bool = False,
+) -> GameRecord:
+    """Play one game of a series, seeding it from the base seed and its index.
+
+    With ``trace`` set the record carries the latency of every move.
+    """
+    if seed is not None:
+        random.seed(seed + index)
+        reset_players(player1, player2)
+
+    tracer = MoveTrace() if trace else None
+    game = Game(Board(size), player1, player2, tracer=tracer)
+
+    while not game.is_over:
+        game.move()
+
+    return game.record(index, () if tracer is None else tuple(tracer.records))
+
+
+def reset_players(*players: Player) -> None:
+    """Clear any state players carry between games, such as search caches."""
+    for player in players:
+        reset = getattr(player, 'reset', None)
+
+        if callable(reset):
+            reset()
+
+
 class Game:
     def __init__(
         self,
@@ -32,6 +81,7 @@ class Game:
         player1: Player = 'Player 1',
         player2: Player = 'Player 2',
         verbose: bool = False,
+        tracer: Tracer | None = None,
     ) -> None:
         self._board = board
         self._players = (
@@ -40,9 +90,32 @@ class Game:
         )
         self._current_player = self._players[Color.BLACK]
         self._verbose = verbose
-        self._valid = self._board.valid_moves(self._current_player.color)
+        self._tracer = tracer
+        self._moves = self._board.moves(self._current_player.color)
         self._score = [0]
 
+    def _play(self, move: Position | None) -> Game:
+        if move is None:
+            if callable(self._current_player.player):
+                move = self._current_player.player(self)
+            else:
+                raise ValueError('Must provide move if current player is not an AI')
+
+        if move & (move - 1) or not move & self._moves:
+            raise ValueError(f'Invalid move: {move}')
+
+        self._board.place_piece(move, self._current_player.color)
+        self._score.append(self._board.score())
+        self.next_turn()
+
+        if not self.has_move and not self.is_over:
+            if self._verbose:
+                print(f'Passing {self._current_player}')
+
+            self.next_turn()
+
+        return self
+
     @property
     def board(self) -> Board:
         return self._board
@@ -56,7 +129,7 @@ class Game:
 
     @property
     def has_move(self) -> bool:
-        return len(self._valid) > 0
+        return self._moves != 0
 
     @property
     def is_over(self) -> bool:
@@ -65,67 +138,89 @@ class Game:
 
         if not self.has_move:
             next_player = self._players[self._current_player.color.opponent]
-            return len(self._board.valid_moves(next_player.color)) == 0
+            return self._board.moves(next_player.color) == 0
 
         return False
 
     def move(self, move: Position | None = None) -> Game:
-        if move is None:
-            if callable(self._current_player.player):
-                move = self._current_player.player(self)
-            else:
-                raise ValueError('Must provide move if current player is not an AI')
-
-        if move not in self._valid:
-            raise ValueError(f'Invalid move: {move}')
-
-        self._board.place_piece(move, self._current_player.color)
-        self._score.append(self._board.score())
-        self.next_turn()
-
-        if not self.has_move and not self.is_over:
-            if self._verbose:
-                print(f'Passing {self._current_player}')
-
-            self.next_turn()
+        if self._tracer is None:
+            return self._play(move)
+
+        color = self._current_player.color
+        ply = len(self._score)
+        empties = self._board.num_empty
+        branching = self._moves.bit_count()
+        start = time.perf_counter()
+        self._play(move)
+        duration = time.perf_counter() - start
+        self._tracer(MoveRecord(color, ply, empties, branching, duration))
+
+        if self._current_player.color is color:
+            # the opponent had no move, so the turn came straight back
+            self._tracer(MoveRecord(color.opponent, ply + 1, empties - 1, 0, 0.0))
 
         return self
 
     def next_turn(self) -> Game:
         self._current_player = self._players[self._current_player.color.opponent]
-        self._valid = self._board.valid_moves(self._current_player.color)
+        self._moves = self._board.moves(self._current_player.color)
         return self
 
+    @property
+    def moves(self) -> Position:
+        return self._moves
+
     @property
     def players(self) -> tuple[AssignedPlayer, AssignedPlayer]:
         return self._players
 
-    def print_results(self) -> None:
-        if not self.is_over:
-            print('The game is not finished')
-            return
-
-        score = [self._board.player_score(player.color) for player in self._players]
-        n_turns = len(self._score) - 1
-
+    def print_record(self, record: GameRecord) -> None:
+        """Print the result of a finished game played by these players."""
         if self._verbose:
             print('Game over!')
 
-            for player, player_score in zip(self._players, score):
-                print(f'{player} score: {player_score}')
+            for player in self._players:
+                print(f'{player} score: {record.score[player.color]}')
 
-        if self.winner is None:
+        if record.winner is None:
             print('Draw')
-        elif self._verbose:
-            print(f'{self.winner} in {n_turns} turns')
+            return
+
+        winner = self._players[record.winner]
+
+        if self._verbose:
+            print(f'{winner} in {record.turns} turns')
         else:
-            print(f'{self.winner} {max(score)}-{min(score)} in {n_turns} turns')
+            high, low = max(record.score), min(record.score)
+            print(f'{winner} {high}-{low} in {record.turns} turns')
+
+    def print_results(self) -> None:
+        if not self.is_over:
+            print('The game is not finished')
+            return
+
+        self.print_record(self.record())
+
+    def record(self, game: int = 0, moves: tuple[MoveRecord, ...] = ()) -> GameRecord:
+        """Return the result of the finished game as the record of a series."""
+        winner = self.winner
+        score = (
+            self._board.player_score(Color.BLACK),
+            self._board.player_score(Color.WHITE),
+        )
+        return GameRecord(
+            game,
+            None if winner is None else winner.color,
+            score,
+            len(self._score) - 1,
+            moves,
+        )
 
     def reset(self) -> Game:
         self._current_player = self._players[Color.BLACK]
         self._board.reset()
         self._score = [0]
-        self._valid = self._board.valid_moves(self._current_player.color)
+        self._moves = self._board.moves(self._current_player.color)
         return self
 
     def result(self, player: Color) -> Result | None:
@@ -150,23 +245,85 @@ class Game:
         player2: Player,
         num_games: int,
         verbose: bool = False,
+        seed: int | None = None,
+        workers: int | None = None,
+        trace: MoveTrace | None = None,
     ) -> dict[AssignedPlayer | None, int]:
-        game = Game(board, player1, player2, verbose)
+        """Play a series of games and count the wins of each player.
+
+        With a seed, game ``i`` is seeded with ``seed + i`` and players are reset
+        before it, so the totals do not depend on the number of workers. With a
+        trace, every move is recorded in it and the latency of each player is
+        printed after the last game.
+        """
+        game = Game(board, player1, player2, verbose, trace)
         results = Counter[AssignedPlayer | None]()
 
-        for _ in range(num_games):
-            while not game.is_over:
-                game.move()
-
-            game.print_results()
-            results[game.winner] += 1
-            game.reset()
+        if workers is not None:
+            stream = Game.stream_series(
+                board.size,
+                player1,
+                player2,
+                num_games,
+                seed,
+                workers,
+                trace is not None,
+            )
+
+            for record in stream:
+                winner = None if record.winner is None else game.players[record.winner]
+                results[winner] += 1
+
+                if trace is not None:
+                    trace.extend(record.moves)
+
+                game.print_record(record)
+        else:
+            for index in range(num_games):
+                if seed is not None:
+                    random.seed(seed + index)
+                    reset_players(player1, player2)
+
+                while not game.is_over:
+                    game.move()
+
+                game.print_results()
+                results[game.winner] += 1
+                game.reset()
+
+        if trace is not None:
+            for player, summary in trace.by_player(game.players).items():
+                print(
+                    f'{player}: {summary.moves} moves, {summary.passes} passes, '
+                    f'p50 {summary.p50 * 1e3:.2f}ms, p99 {summary.p99 * 1e3:.2f}ms, '
+                    f'max {summary.max * 1e3:.2f}ms'
+                )
 
         return results
 
+    @staticmethod
+    def stream_series(
+        size: int,
+        player1: Player,
+        player2: Player,
+        num_games: int,
+        seed: int | None = None,
+        workers: int | None = None,
+        trace: bool = False,
+    ) -> Iterator[GameRecord]:
+        """Play games over a process pool, yielding each record as it finishes."""
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(play_game, size, player1, player2, index, seed, trace)
+                for index in range(num_games)
+            ]
+
+            for future in as_completed(futures):
+                yield future.result()
+
     @property
     def valid(self) -> PositionSet:
-        return self._valid
+        return split_position(self._moves)
 
     @property
     def winner(self) -> AssignedPlayer | None:
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class PickleByName(Enum):
+    """Enum whose members are pickled by name rather than by value.
+
+    Members that wrap callables cannot be looked up by value, since the
+    callables do not compare equal once copied to another process.
+    """
+
+    def __reduce_ex__(self, protocol: object) -> tuple[object, tuple[type, str]]:
+        return getattr, (self.__class__, self.name)
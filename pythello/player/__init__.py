@@ -1,6 +1,18 @@
+from .book import BookPlayer, OpeningBook, build_book
 from .greedy import greedy_move
 from .heuristic import Heuristic
+from .mcts import MCTS
 from .negamax import Negamax
 from .player import AI, Player
 
-__all__ = ['AI', 'Heuristic', 'Negamax', 'Player', 'greedy_move']
+__all__ = [
+    'AI',
+    'BookPlayer',
+    'Heuristic',
+    'MCTS',
+    'Negamax',
+    'OpeningBook',
+    'Player',
+    'build_book',
+    'greedy_move',
+]
@@ -0,0 +1,254 @@
+"""Opening books stored as sorted, memory-mapped binary files.
+
+A book file is a little-endian header followed by four arrays of equal length:
+the canonical Zobrist keys in ascending order, then the score, the search depth
+and the best move square of each key. Moves are stored in the orientation of
+the canonical position. Readers map the file and bisect the key array in place,
+so any number of processes share one copy of the book through the page cache.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, NamedTuple
+
+from pythello.board import Board, Color, inverse_transform, iterate_position, transform
+
+if TYPE_CHECKING:
+    from pythello.board import Position
+    from pythello.game import Game
+    from pythello.player import Player
+    from pythello.player.negamax import Negamax
+
+MAGIC = b'PYTHBOOK'
+VERSION = 1
+HEADER = struct.Struct('<8sHHIQ8x')  # magic, version, board size, max discs, count
+
+
+class BookEntry(NamedTuple):
+    move: Position
+    score: float
+    depth: int
+
+
+class OpeningBook:
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        if sys.byteorder != 'little':
+            raise ValueError('Opening books can only be mapped on little-endian hosts')
+
+        self.path = os.fspath(path)
+
+        with open(self.path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, size, max_discs, count = HEADER.unpack_from(self._mmap)
+
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f'Not a version {VERSION} opening book: {self.path}')
+
+        self.board_size = size
+        self.max_discs = max_discs
+        self._view = view = memoryview(self._mmap)
+        start = HEADER.size
+        self._keys = view[start : start + 8 * count].cast('Q')
+        start += 8 * count
+        self._scores = view[start : start + 4 * count].cast('f')
+        start += 4 * count
+        self._depths = view[start : start + 2 * count].cast('H')
+        start += 2 * count
+        self._moves = view[start : start + 2 * count].cast('H')
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, int) and self._find(key) >= 0
+
+    def __enter__(self) -> OpeningBook:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __reduce__(self) -> tuple[type[OpeningBook], tuple[str]]:
+        # worker processes map the file themselves instead of copying it
+        return OpeningBook, (self.path,)
+
+    def _find(self, key: int) -> int:
+        index = bisect_left(self._keys, key)
+
+        if index < len(self._keys) and self._keys[index] == key:
+            return index
+
+        return -1
+
+    def close(self) -> None:
+        """Release the views and unmap the file."""
+        for view in (self._keys, self._scores, self._depths, self._moves):
+            view.release()
+
+        self._view.release()
+
+        self._mmap.close()
+
+    def get(self, key: int) -> BookEntry | None:
+        """Return the entry of a canonical key, with the move in canonical form."""
+        index = self._find(key)
+
+        if index < 0:
+            return None
+
+        return BookEntry(
+            1 << self._moves[index], self._scores[index], self._depths[index]
+        )
+
+    def probe(self, board: Board, player: Color) -> BookEntry | None:
+        """Return the book entry of a position, with the move mapped onto it."""
+        if board.size != self.board_size:
+            return None
+
+        if board.filled.bit_count() > self.max_discs:
+            return None
+
+        key, _, _, index = board.canonical_zobrist(player)
+        entry = self.get(key)
+
+        if entry is None:
+            return None
+
+        return entry._replace(move=inverse_transform(entry.move, board.size, index))
+
+
+class BookPlayer:
+    """Play book moves while in book and defer to another player otherwise."""
+
+    def __init__(self, book: OpeningBook, player: Player) -> None:
+        self.book = book
+        self.player = player
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, game: Game) -> Position:
+        entry = self.book.probe(game.board, game.current_player.color)
+
+        if entry is not None and entry.move & game.moves:
+            self.hits += 1
+            return entry.move
+
+        self.misses += 1
+
+        if not callable(self.player):
+            raise ValueError('Must provide move if out of book with a human player')
+
+        return self.player(game)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.player})'
+
+    def reset(self) -> None:
+        reset = getattr(self.player, 'reset', None)
+
+        if callable(reset):
+            reset()
+
+
+def build_book(
+    path: str | os.PathLike[str],
+    searcher: Negamax,
+    num_games: int,
+    plies: int,
+    size: int = 8,
+    exploration: float = 0.5,
+    seed: int | None = None,
+) -> int:
+    """Write a book of searched positions from the first plies of self-play games.
+
+    Every position reached is searched once. The game then continues with the
+    best move found, or with a random move at the rate set by exploration so
+    that later games branch away from earlier ones. Return the number of entries.
+    """
+    if num_games <= 0:
+        raise ValueError('Number of games must be strictly positive')
+
+    if plies <= 0:
+        raise ValueError('Plies must be strictly positive')
+
+    if not 0 <= exploration <= 1:
+        raise ValueError('Exploration must be between 0 and 1')
+
+    rng = random.Random(seed)
+    entries: dict[int, tuple[int, float, int]] = {}
+
+    for _ in range(num_games):
+        board = Board(size)
+        player = Color.BLACK
+
+        for _ in range(plies):
+            moves = board.moves(player)
+
+            if not moves:
+                player = player.opponent
+                moves = board.moves(player)
+
+                if not moves:
+                    break
+
+            key, _, _, index = board.canonical_zobrist(player)
+
+            if key in entries:
+                square, _, _ = entries[key]
+                move = inverse_transform(1 << square, size, index)
+            else:
+                move = searcher.search(board, player)
+                entries[key] = (
+                    transform(move, size, index).bit_length() - 1,
+                    searcher.score or 0.0,
+                    searcher.completed_depth,
+                )
+
+            if rng.random() < exploration:
+                move = rng.choice(list(iterate_position(moves)))
+
+            board.apply(move, player)
+            player = player.opponent
+
+    write_book(path, entries, size, plies + 4)
+    return len(entries)
+
+
+def write_book(
+    path: str | os.PathLike[str],
+    entries: dict[int, tuple[int, float, int]],
+    size: int,
+    max_discs: int,
+) -> None:
+    """Write entries of canonical key to move square, score and depth to a book.
+
+    The file is written beside the target and moved into place, so processes
+    that already mapped the old book keep reading a consistent file.
+    """
+    keys = array('Q', sorted(entries))
+    scores = array('f', (entries[key][1] for key in keys))
+    depths = array('H', (entries[key][2] for key in keys))
+    moves = array('H', (entries[key][0] for key in keys))
+
+    if sys.byteorder != 'little':
+        for table in (keys, scores, depths, moves):
+            table.byteswap()
+
+    path = os.fspath(path)
+    temporary = f'{path}.tmp'
+
+    with open(temporary, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, size, max_discs, len(keys)))
+
+        for table in (keys, scores, depths, moves):
+            table.tofile(file)
+
+    os.replace(temporary, path)
@@ -4,6 +4,8 @@ import random
 from collections import defaultdict
 from typing import TYPE_CHECKING
 
+from pythello.board import iterate_position
+
 if TYPE_CHECKING:
     from pythello.board import Position
     from pythello.game import Game
@@ -11,8 +13,9 @@ if TYPE_CHECKING:
 
 def greedy_move(game: Game) -> Position:
     num_turned = defaultdict(list)
+    board, player = game.board, game.current_player.color
 
-    for move in game.valid:
-        num_turned[len(game.captured(move))].append(move)
+    for move in iterate_position(game.moves):
+        num_turned[board.flips(player, move).bit_count()].append(move)
 
     return random.choice(num_turned[max(num_turned.keys())])
@@ -4,6 +4,8 @@ import random
 from collections import defaultdict
 from typing import TYPE_CHECKING
 
+from pythello.board import iterate_position
+
 if TYPE_CHECKING:
     from pythello.board import Position
     from pythello.game import Game
@@ -16,10 +18,11 @@ class Heuristic:
 
     def __call__(self, game: Game) -> Position:
         scores = defaultdict(list)
-        player = game.current_player.color
+        board, player = game.board.copy(), game.current_player.color
 
-        for move in game.valid:
-            board = game.board.peek(move, player)
+        for move in iterate_position(game.moves):
+            flips = board.apply(move, player)
             scores[self.scorer(board, player)].append(move)
+            board.undo(move, flips, player)
 
         return random.choice(scores[max(scores.keys())])
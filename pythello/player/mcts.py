@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING
+
+from pythello.board import Color, iterate_position
+
+if TYPE_CHECKING:
+    from pythello.board import Board, Position
+    from pythello.game import Game
+    from pythello.score import Scorer
+
+DEFAULT_PLAYOUTS = 1000
+DEFAULT_EXPLORATION = 1.4
+# scorer differences are divided by this before the softmax that makes priors
+PRIOR_TEMPERATURE = 8.0
+# square of a pass, and child count of a node whose children are not known yet
+PASS = -1
+UNEXPANDED = -1
+# value of a child never visited when priors guide the selection
+FIRST_PLAY_VALUE = 0.5
+# plies after the last root searched for the new root when reusing the tree
+REUSE_PLIES = 2
+
+
+class Tree:
+    """Nodes of a search tree in parallel arrays, the children of each side by side.
+
+    Values are the wins, counting draws as half, of the player who moved into
+    the node, so that a parent picks the child with the best value for itself.
+    """
+
+    def __init__(self) -> None:
+        self.square = array('h')
+        self.first = array('l')
+        self.count = array('h')
+        self.visits = array('l')
+        self.wins = array('d')
+        self.prior = array('d')
+        self.add(PASS, 1.0)
+
+    def __len__(self) -> int:
+        return len(self.square)
+
+    def add(self, square: int, prior: float) -> int:
+        self.square.append(square)
+        self.first.append(0)
+        self.count.append(UNEXPANDED)
+        self.visits.append(0)
+        self.wins.append(0.0)
+        self.prior.append(prior)
+        return len(self.square) - 1
+
+    def children(self, node: int) -> range:
+        count = self.count[node]
+        return range(self.first[node], self.first[node] + max(count, 0))
+
+    def expand(self, node: int, squares: list[int], priors: list[float]) -> None:
+        self.first[node] = len(self.square)
+        self.count[node] = len(squares)
+
+        for square, prior in zip(squares, priors):
+            self.add(square, prior)
+
+    def subtree(self, node: int) -> Tree:
+        """Return a compact copy of the subtree under a node, rooted at index 0."""
+        tree = Tree()
+        tree.wins[0] = self.wins[node]
+        tree.visits[0] = self.visits[node]
+        queue = deque([(node, 0)])
+
+        while queue:
+            old, new = queue.popleft()
+
+            if self.count[old] == UNEXPANDED:
+                continue
+
+            tree.first[new] = len(tree)
+            tree.count[new] = self.count[old]
+
+            for child in self.children(old):
+                index = tree.add(self.square[child], self.prior[child])
+                tree.visits[index] = self.visits[child]
+                tree.wins[index] = self.wins[child]
+                queue.append((child, index))
+
+        return tree
+
+
+class MCTS:
+    """Monte Carlo tree search with UCT, and priors from a scorer when given.
+
+    Each search runs a number of random playouts, or as many as fit in a time
+    limit, and plays the most visited move. The subtree of the position reached
+    on the next call is kept when it can be found within two plies of the last
+    root, so the opponent's reply does not throw the work away.
+    """
+
+    def __init__(
+        self,
+        scorer: Scorer | None = None,
+        playouts: int | None = DEFAULT_PLAYOUTS,
+        time_limit: float | None = None,
+        exploration: float = DEFAULT_EXPLORATION,
+        reuse: bool = True,
+    ) -> None:
+        if playouts is None and time_limit is None:
+            raise ValueError('Playouts can only be None with a time limit')
+
+        if playouts is not None and playouts <= 0:
+            raise ValueError('Playouts must be strictly positive or None')
+
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError('Time limit must be strictly positive or None')
+
+        if exploration <= 0:
+            raise ValueError('Exploration must be strictly positive')
+
+        self.scorer = scorer
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.reuse = reuse
+        self.tree = Tree()
+        self.completed = 0
+        self.reused = 0
+        self.seconds = 0.0
+        self._board: Board | None = None
+        self._player = Color.BLACK
+
+    def __call__(self, game: Game) -> Position:
+        return self.search(game.board, game.current_player.color)
+
+    @property
+    def playouts_per_second(self) -> float:
+        """Return the rate of playouts of the last search."""
+        return self.completed / self.seconds if self.seconds else 0.0
+
+    def reset(self) -> None:
+        """Forget the tree kept from earlier searches."""
+        self.tree = Tree()
+        self._board = None
+
+    def search(self, board: Board, player: Color) -> Position:
+        """Return the most visited move for the specified player."""
+        start = time.perf_counter()
+        deadline = math.inf if self.time_limit is None else start + self.time_limit
+        playouts = math.inf if self.playouts is None else self.playouts
+        self._reroot(board, player)
+        self.reused = self.tree.visits[0]
+        self.completed = 0
+
+        # the first playout always completes so the root has moves to pick from
+        while True:
+            self._iterate(board.copy(), player)
+            self.completed += 1
+
+            if self.completed >= playouts or time.perf_counter() >= deadline:
+                break
+
+        self.seconds = time.perf_counter() - start
+        tree = self.tree
+        best = max(tree.children(0), key=tree.visits.__getitem__)
+        move: Position = 1 << tree.square[best]
+        return move
+
+    def _expand(self, node: int, board: Board, player: Color) -> None:
+        moves = board.moves(player)
+
+        if not moves:
+            if board.has_moves(player.opponent):
+                self.tree.expand(node, [PASS], [1.0])
+            else:
+                self.tree.expand(node, [], [])
+
+            return
+
+        squares = [move.bit_length() - 1 for move in iterate_position(moves)]
+
+        if self.scorer is None:
+            self.tree.expand(node, squares, [1 / len(squares)] * len(squares))
+            return
+
+        scores = []
+
+        for square in squares:
+            move = 1 << square
+            flips = board.apply(move, player)
+            scores.append(self.scorer(board, player))
+            board.undo(move, flips, player)
+
+        # a softmax of the scores, shifted by the best one so none overflows
+        best = max(scores)
+        weights = [math.exp((score - best) / PRIOR_TEMPERATURE) for score in scores]
+        total = sum(weights)
+        self.tree.expand(node, squares, [weight / total for weight in weights])
+
+    def _iterate(self, board: Board, player: Color) -> None:
+        tree = self.tree
+        node = 0
+        path = [0]
+        movers = [player.opponent]
+
+        while True:
+            leaf = tree.count[node] == UNEXPANDED
+
+            if leaf:
+                self._expand(node, board, player)
+
+            if tree.count[node] == 0:
+                break
+
+            node = self._select(node)
+            player = self._play(node, board, player)
+            path.append(node)
+            movers.append(player.opponent)
+
+            if leaf:
+                break
+
+        score = playout(board, player)
+        visits, wins = tree.visits, tree.wins
+
+        for node, mover in zip(path, movers):
+            visits[node] += 1
+
+            if score == 0:
+                wins[node] += 0.5
+            elif (score > 0) == (mover is Color.BLACK):
+                wins[node] += 1.0
+
+    def _play(self, node: int, board: Board, player: Color) -> Color:
+        square = self.tree.square[node]
+
+        if square != PASS:
+            board.apply(1 << square, player)
+
+        return player.opponent
+
+    def _find(
+        self, board: Board, player: Color, target: Board, target_player: Color
+    ) -> int | None:
+        """Return the node of a position within a few plies of the root, if any."""
+        frontier = [(0, board, player)]
+
+        for _ in range(REUSE_PLIES + 1):
+            deeper = []
+
+            for node, board, player in frontier:
+                if player is target_player and board == target:
+                    return node
+
+                for child in self.tree.children(node):
+                    child_board = board.copy()
+                    child_player = self._play(child, child_board, player)
+                    deeper.append((child, child_board, child_player))
+
+            frontier = deeper
+
+        return None
+
+    def _reroot(self, board: Board, player: Color) -> None:
+        last, last_player = self._board, self._player
+        self._board, self._player = board.copy(), player
+        node = None
+
+        if self.reuse and last is not None and last.size == board.size:
+            node = self._find(last, last_player, board, player)
+
+        if node is None:
+            self.tree = Tree()
+        elif node:
+            self.tree = self.tree.subtree(node)
+
+    def _select(self, node: int) -> int:
+        """Return the child of a node with the highest upper confidence bound."""
+        tree = self.tree
+        visits, wins = tree.visits, tree.wins
+        first = tree.first[node]
+        children = range(first, first + tree.count[node])
+        best, best_bound = first, -math.inf
+
+        if self.scorer is None:
+            log_total = math.log(visits[node] or 1)
+
+            for child in children:
+                count = visits[child]
+
+                if not count:
+                    return child
+
+                bound = wins[child] / count + self.exploration * math.sqrt(
+                    log_total / count
+                )
+
+                if bound > best_bound:
+                    best, best_bound = child, bound
+
+            return best
+
+        prior = tree.prior
+        scale = self.exploration * math.sqrt(visits[node])
+
+        for child in children:
+            count = visits[child]
+            value = wins[child] / count if count else FIRST_PLAY_VALUE
+            bound = value + scale * prior[child] / (1 + count)
+
+            if bound > best_bound:
+                best, best_bound = child, bound
+
+        return best
+
+
+def playout(board: Board, player: Color) -> int:
+    """Play random moves to the end of the game and return the black score."""
+    passed = False
+
+    while True:
+        moves = board.moves(player)
+
+        if moves:
+            passed = False
+
+            # drop a random number of the lowest moves and play the next one
+            for _ in range(random.randrange(moves.bit_count())):
+                moves &= moves - 1
+
+            board.apply(moves & -moves, player)
+        elif passed:
+            return board.score()
+        else:
+            passed = True
+
+        player = player.opponent
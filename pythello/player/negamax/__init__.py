@@ -1,3 +1,12 @@
 from .negamax import Negamax
+from .persistent import PersistentTable
+from .stats import DepthStats, SearchStats
+from .table import TranspositionTable
 
-__all__ = ['Negamax']
+__all__ = [
+    'DepthStats',
+    'Negamax',
+    'PersistentTable',
+    'SearchStats',
+    'TranspositionTable',
+]
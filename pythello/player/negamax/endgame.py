@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import time
+from functools import cache
+from typing import TYPE_CHECKING
+
+from pythello.board import iterate_position
+
+from .table import TranspositionTable
+from .tree import CHECK_INTERVAL, BudgetExceeded, TreeNode, bound_flag, narrow
+
+if TYPE_CHECKING:
+    from pythello.board import Board, Color, Position
+
+DEFAULT_TABLE_MB = 1.0
+INF = float('inf')
+
+# below these empty counts the table and fastest-first ordering cost more than
+# they save, so the solver falls back to parity ordering alone
+TABLE_MIN_EMPTIES = 6
+FASTEST_FIRST_MIN_EMPTIES = 7
+
+
+@cache
+def regions(size: int) -> dict[Position, int]:
+    """Map every square to the mask of the board quadrant containing it."""
+    half = size // 2
+    quadrants: dict[tuple[bool, bool], int] = {}
+    squares = {}
+
+    for row in range(size):
+        for col in range(size):
+            square = 1 << (row * size + col)
+            quadrant = (row < half, col < half)
+            quadrants[quadrant] = quadrants.get(quadrant, 0) | square
+            squares[square] = quadrant
+
+    return {square: quadrants[quadrant] for square, quadrant in squares.items()}
+
+
+class EndgameSolver:
+    """Perfect-play solver returning exact final disc differentials.
+
+    With ``wld`` set the solver only proves a win, loss or draw, searching a
+    (-1, 1) window and returning 1, -1 or 0 instead of the exact differential.
+    """
+
+    def __init__(self, wld: bool = False, table_mb: float = DEFAULT_TABLE_MB) -> None:
+        self.wld = wld
+        self.table_mb = table_mb
+        self.table: TranspositionTable | None = None
+        self.nodes = 0
+        self._deadline = INF
+        self._max_nodes = INF
+
+    def solve(
+        self,
+        board: Board,
+        player: Color,
+        deadline: float = INF,
+        max_nodes: float = INF,
+    ) -> tuple[Position, int]:
+        """Return the best move and its final score for the specified player."""
+        board = board.copy()
+
+        if self.table is None or self.table.board_size != board.size:
+            self.table = TranspositionTable(self.table_mb, board.size)
+
+        self.table.new_search()
+        self.nodes = 0
+        self._deadline = deadline
+        self._max_nodes = max_nodes
+
+        bound = board.size**2
+        alpha, beta = (-1, 1) if self.wld else (-bound, bound)
+        opponent = player.opponent
+        best_move, best_score = 0, -bound - 1
+
+        for move in self._order(board, player, board.moves(player), board.num_empty):
+            flips = board.apply(move, player)
+            score = -self._solve(board, opponent, -beta, -alpha, False)
+            board.undo(move, flips, player)
+
+            if score > best_score:
+                best_move, best_score = move, score
+                alpha = max(alpha, score)
+
+                if alpha >= beta:
+                    break
+
+        if self.wld:
+            best_score = (best_score > 0) - (best_score < 0)
+
+        return best_move, best_score
+
+    def _order(
+        self,
+        board: Board,
+        player: Color,
+        moves: Position,
+        empties: int,
+        hash_move: Position = 0,
+    ) -> list[Position]:
+        if moves & (moves - 1) == 0:
+            return [moves]
+
+        empty = board.empty
+        quadrant = regions(board.size)
+
+        if empties < FASTEST_FIRST_MIN_EMPTIES:
+            # moves into regions with an odd number of empties keep the last move
+            ordered = sorted(
+                iterate_position(moves),
+                key=lambda m: not (empty & quadrant[m]).bit_count() & 1,
+            )
+        else:
+            # fastest first: leave the opponent as few replies as possible
+            opponent = player.opponent
+            keyed = []
+
+            for move in iterate_position(moves):
+                flips = board.apply(move, player)
+                odd = (empty & quadrant[move]).bit_count() & 1
+                keyed.append((board.num_moves(opponent), not odd, move))
+                board.undo(move, flips, player)
+
+            keyed.sort()
+            ordered = [move for _, _, move in keyed]
+
+        if hash_move > 0 and hash_move & moves:
+            ordered.remove(hash_move)
+            ordered.insert(0, hash_move)
+
+        return ordered
+
+    def _solve(
+        self, board: Board, player: Color, alpha: int, beta: int, passed: bool
+    ) -> int:
+        self.nodes += 1
+
+        if self.nodes >= self._max_nodes or (
+            self.nodes & CHECK_INTERVAL == 0 and time.perf_counter() >= self._deadline
+        ):
+            raise BudgetExceeded
+
+        opponent = player.opponent
+        moves = board.moves(player)
+
+        if moves == 0:
+            if passed:
+                return board.score(player)
+
+            return -self._solve(board, opponent, -beta, -alpha, True)
+
+        empties = board.num_empty
+        upper = self._stability_bound(board, opponent, alpha)
+
+        if upper is not None:
+            return upper
+
+        key, node = self._probe(board, player, empties)
+        hash_move = 0
+
+        if node is not None:
+            low, high = narrow(node, alpha, beta)
+            alpha, beta = int(low), int(high)
+
+            if alpha >= beta:
+                return int(node.score)
+
+            hash_move = node.move
+
+        alpha_orig = alpha
+        best_move = 0
+        best_score = -board.size**2 - 1
+
+        for move in self._order(board, player, moves, empties, hash_move):
+            flips = board.apply(move, player)
+            score = -self._solve(board, opponent, -beta, -alpha, False)
+            board.undo(move, flips, player)
+
+            if score > best_score:
+                best_move, best_score = move, score
+                alpha = max(alpha, score)
+
+                if alpha >= beta:
+                    break
+
+        if key is not None and self.table is not None:
+            flag = bound_flag(best_score, alpha_orig, beta)
+            black, white = board.players
+            self.table[key] = TreeNode(
+                best_move, best_score, empties, flag, black, white
+            )
+
+        return best_score
+
+    def _probe(
+        self, board: Board, player: Color, empties: int
+    ) -> tuple[int | None, TreeNode | None]:
+        """Return the table key of a position and its entry, if the table is used."""
+        if empties < TABLE_MIN_EMPTIES or self.table is None:
+            return None, None
+
+        key = board.zobrist(player)
+        node = self.table.get(key)
+        black, white = board.players
+
+        if node is not None and (node.black != black or node.white != white):
+            node = None
+
+        return key, node
+
+    def _stability_bound(self, board: Board, opponent: Color, alpha: int) -> int | None:
+        """Return an upper bound failing low on the opponent's stable discs, if any.
+
+        The opponent keeps its stable discs, capping the final differential.
+        They are only counted when the opponent has enough discs to fail low.
+        """
+        bound = board.size**2
+
+        if alpha < bound - 2 * board.player_score(opponent):
+            return None
+
+        upper = bound - 2 * board.player_stable(opponent)
+        return upper if upper <= alpha else None
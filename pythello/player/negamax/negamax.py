@@ -1,101 +1,535 @@
 from __future__ import annotations
 
+import time
 from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
 from typing import TYPE_CHECKING
 
+from pythello.board import inverse_transform, iterate_position, transform
+from pythello.score import scorer_signature
+
 from .cache import LRUCache
-from .tree import TreeFlag, TreeNode
+from .endgame import EndgameSolver
+from .ordering import MoveOrdering
+from .parallel import init_worker, search_child
+from .persistent import PersistentTable
+from .stats import DepthStats, SearchStats
+from .table import TranspositionTable
+from .tree import CHECK_INTERVAL, BudgetExceeded, TreeNode, bound_flag, narrow
 
 if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable
+
     from pythello.board import Board, Color, Position
     from pythello.game import Game
     from pythello.score import Scorer
 
-    TranspositionTable = MutableMapping[tuple[Board, Color], TreeNode]
+    Cache = MutableMapping[int, TreeNode]
 
 DEFAULT_DEPTH = 4
 INF = float('inf')
 
 
+def make_cache(
+    scorer: Scorer,
+    cache_size: int | None = None,
+    cache_mb: float | None = None,
+    cache_path: str | os.PathLike[str] | None = None,
+) -> Cache:
+    """Create the cache a search was configured with, a dict by default."""
+    if cache_size is not None and cache_size <= 0:
+        raise ValueError('Cache size must be strictly positive or None')
+
+    if cache_mb is not None and cache_mb <= 0:
+        raise ValueError('Cache memory must be strictly positive or None')
+
+    if cache_size is not None and cache_mb is not None:
+        raise ValueError('Only one of cache size and cache memory can be set')
+
+    if cache_path is not None and cache_mb is None:
+        raise ValueError('Cache path requires a cache memory size')
+
+    if cache_mb is not None and cache_path is not None:
+        signature = scorer_signature(scorer)
+        return PersistentTable(cache_path, cache_mb, signature=signature)
+
+    if cache_mb is not None:
+        return TranspositionTable(cache_mb)
+
+    if cache_size is not None:
+        return LRUCache(cache_size)
+
+    return {}
+
+
 class Negamax:
     def __init__(
-        self, scorer: Scorer, depth: int = DEFAULT_DEPTH, cache_size: int | None = None
+        self,
+        scorer: Scorer,
+        depth: int | None = DEFAULT_DEPTH,
+        cache_size: int | None = None,
+        cache_mb: float | None = None,
+        cache_path: str | os.PathLike[str] | None = None,
+        time_limit: float | None = None,
+        node_limit: int | None = None,
+        ordering: bool = True,
+        pvs: bool = False,
+        aspiration: float | None = None,
+        endgame_empties: int | None = None,
+        endgame_wld: bool = False,
+        workers: int | None = None,
+        symmetry: bool = False,
+        stats: bool = False,
     ) -> None:
-        if depth <= 0:
-            raise ValueError('Depth must be strictly positive')
+        if depth is None and time_limit is None and node_limit is None:
+            raise ValueError('Depth can only be None with a time or node limit')
+
+        if depth is not None and depth <= 0:
+            raise ValueError('Depth must be strictly positive or None')
+
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError('Time limit must be strictly positive or None')
 
-        if cache_size is not None and cache_size <= 0:
-            raise ValueError('Cache size must be strictly positive or None')
+        if node_limit is not None and node_limit <= 0:
+            raise ValueError('Node limit must be strictly positive or None')
+
+        if aspiration is not None and aspiration <= 0:
+            raise ValueError('Aspiration window must be strictly positive or None')
+
+        if endgame_empties is not None and endgame_empties <= 0:
+            raise ValueError('Endgame empties must be strictly positive or None')
+
+        if workers is not None and workers <= 0:
+            raise ValueError('Workers must be strictly positive or None')
+
+        if workers is not None and (
+            depth is None
+            or time_limit is not None
+            or node_limit is not None
+            or aspiration is not None
+        ):
+            raise ValueError('Parallel search requires a fixed depth')
 
         self.scorer = scorer
         self.depth = depth
-        self.cache: TranspositionTable
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.pvs = pvs
+        self.aspiration = aspiration
+        self.endgame_empties = endgame_empties
+        self.endgame = EndgameSolver(endgame_wld) if endgame_empties else None
+        self.workers = workers
+        self.symmetry = symmetry
+        self._pool: ProcessPoolExecutor | None = None
+        self.cache = make_cache(scorer, cache_size, cache_mb, cache_path)
 
-        if cache_size is not None:
-            self.cache = LRUCache(cache_size)
-        else:
-            self.cache = {}
+        self.ordering = MoveOrdering() if ordering else None
+        self.stats = SearchStats() if stats else None
+        self.completed_depth = 0
+        self.score: float | None = None
+        self.solved = False
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self._root_move: Position = 0
+        self._deadline = INF
+        self._max_nodes = INF
 
     def __call__(self, game: Game) -> Position:
-        board, player = game.board, game.current_player.color
-        negamax(board, player, self.scorer, self.cache, self.depth)
-        return self.cache[(board, player)].move
+        return self.search(game.board, game.current_player.color)
 
+    def __getstate__(self) -> dict[str, object]:
+        # process pools cannot be pickled, and copies start without one
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
 
-def negamax(
-    board: Board,
-    player: Color,
-    scorer: Scorer,
-    cache: TranspositionTable,
-    depth: int,
-    alpha: float = -INF,
-    beta: float = INF,
-) -> float:
-    alpha_orig = alpha
-    node = cache.get((board, player))
-
-    if node is not None and node.depth >= depth:
-        if node.flag is TreeFlag.EXACT:
-            return node.score
-        elif node.flag is TreeFlag.LOWER:
-            alpha = max(alpha, node.score)
-        elif node.flag is TreeFlag.UPPER:
-            beta = min(beta, node.score)
-
-        if alpha >= beta:
-            return node.score
-
-    opponent = player.opponent
-    player_moves = board.valid_moves(player)
-    opponent_moves = board.valid_moves(opponent)
-
-    if len(player_moves) == 0 and len(opponent_moves) > 0:
-        return -negamax(board, opponent, scorer, cache, depth, -beta, -alpha)
-
-    if depth == 0 or (len(player_moves) == 0 and len(opponent_moves) == 0):
-        return scorer(board, player)
-
-    best_move = -1
-    best_score = -INF
-
-    for move in player_moves:
-        child = board.peek(move, player)
-        score = -negamax(child, opponent, scorer, cache, depth - 1, -beta, -alpha)
-
-        if score > best_score:
-            best_move = move
-            best_score = score
-            alpha = max(alpha, score)
+    @property
+    def budgeted(self) -> bool:
+        """Check if the search runs under a time or node budget."""
+        return self.time_limit is not None or self.node_limit is not None
 
-            if alpha >= beta:
+    def close(self) -> None:
+        """Shut down parallel workers and flush a persistent cache to disk."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+        if isinstance(self.cache, PersistentTable):
+            self.cache.flush()
+
+    def evaluate(
+        self,
+        board: Board,
+        player: Color,
+        depth: int,
+        alpha: float = -INF,
+        beta: float = INF,
+    ) -> float:
+        """Return the score of a position searched to the given depth."""
+        board = board.copy()
+        self.nodes = 0
+        self._deadline = self._max_nodes = INF
+        self._new_search(board)
+        return self._negamax(board, player, depth, alpha, beta)
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """Return the fraction of beta cutoffs caused by the first move searched."""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def iterative(self) -> bool:
+        """Check if the search deepens iteratively from depth 1."""
+        return self.budgeted or self.aspiration is not None
+
+    def reset(self) -> None:
+        """Forget everything learned in earlier searches.
+
+        A persistent cache is kept, since outliving the search is its purpose.
+        """
+        if not isinstance(self.cache, PersistentTable):
+            self.cache.clear()
+
+        if self.ordering is not None:
+            self.ordering = MoveOrdering()
+
+        if self.endgame is not None:
+            self.endgame.table = None
+
+    def search(self, board: Board, player: Color) -> Position:
+        """Return the best move for the specified player."""
+        if self.stats is None:
+            return self._search(board, player)
+
+        self.stats.reset(self)
+        start = time.perf_counter()
+        move = self._search(board, player)
+        self.stats.finish(self, time.perf_counter() - start)
+        return move
+
+    def _search(self, board: Board, player: Color) -> Position:
+        board = board.copy()
+        self.nodes = self.cutoffs = self.first_move_cutoffs = 0
+        self.solved = False
+        deadline = max_nodes = INF
+
+        if self.time_limit is not None:
+            deadline = time.perf_counter() + self.time_limit
+
+        if self.node_limit is not None:
+            max_nodes = self.node_limit
+
+        self._new_search(board)
+
+        if self.endgame is not None and self.endgame_empties is not None:
+            if board.num_empty <= self.endgame_empties:
+                try:
+                    return self._solve(self.endgame, board, player, deadline, max_nodes)
+                except BudgetExceeded:
+                    # fall back to the heuristic search with what is left
+                    self.nodes = self.endgame.nodes
+
+        if self.depth is not None and self.workers is not None:
+            return self._search_parallel(board, player, self.depth)
+
+        if self.depth is not None and not self.iterative:
+            self._deadline = self._max_nodes = INF
+            self.score = self._negamax(board, player, self.depth)
+            self.completed_depth = self.depth
+            return self._root_move
+
+        moves = board.moves(player)
+
+        if self.budgeted and moves & (moves - 1) == 0:
+            self.completed_depth = 0
+            self.score = None
+            return moves
+
+        max_depth = board.num_empty
+
+        if self.depth is not None:
+            max_depth = min(max_depth, self.depth)
+
+        # the first iteration always completes so there is a move to return
+        self._deadline = self._max_nodes = INF
+        start = time.perf_counter()
+        score = self._negamax(board, player, 1)
+        best_move = self._root_move
+        self.completed_depth = 1
+        self._record_depth(1, 0, start)
+
+        self._deadline = deadline
+        self._max_nodes = max_nodes
+
+        for depth in range(2, max_depth + 1):
+            nodes = self.nodes
+            start = time.perf_counter()
+
+            try:
+                score = self._aspiration(board.copy(), player, depth, score)
+            except BudgetExceeded:
                 break
 
-    if best_score <= alpha_orig:
-        flag = TreeFlag.UPPER
-    elif best_score >= beta:
-        flag = TreeFlag.LOWER
-    else:
-        flag = TreeFlag.EXACT
+            best_move = self._root_move
+            self.completed_depth = depth
+            self._record_depth(depth, nodes, start)
+
+        self.score = score
+        return best_move
+
+    def _key(self, board: Board, player: Color) -> tuple[int, int, int, int]:
+        """Return the cache key, the bitboards it stores and their transform.
+
+        With symmetry, rotated and mirrored positions share the key of their
+        canonical form, and moves are stored in the canonical orientation.
+        """
+        if self.symmetry:
+            return board.canonical_zobrist(player)
+
+        black, white = board.players
+        return board.zobrist(player), black, white, 0
+
+    def _new_search(self, board: Board) -> None:
+        if self.ordering is not None:
+            self.ordering.new_search()
+
+        if isinstance(self.cache, TranspositionTable):
+            if self.cache.board_size != board.size:
+                self.cache = self.cache.resize(board.size)
+
+            self.cache.new_search()
+
+    def _record_depth(self, depth: int, nodes: int, start: float) -> None:
+        """Record the nodes and time of a completed iteration when keeping stats."""
+        if self.stats is not None:
+            seconds = time.perf_counter() - start
+            self.stats.depths.append(DepthStats(depth, self.nodes - nodes, seconds))
+
+    def _search_parallel(self, board: Board, player: Color, depth: int) -> Position:
+        """Split the root moves across worker processes.
+
+        The first move is searched alone to get a bound, then the remaining moves
+        are searched concurrently against it, so the result matches the serial
+        search at the same depth.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self.workers, initializer=init_worker, initargs=(self,)
+            )
+
+        opponent = player.opponent
+        player_moves = board.moves(player)
+
+        if self.ordering is None:
+            moves = list(iterate_position(player_moves))
+        else:
+            moves = self.ordering.order(player_moves, player, 0, board.size)
+
+        children = []
+
+        for move in moves:
+            child = board.copy()
+            child.apply(move, player)
+            children.append(child)
+
+        first = self._pool.submit(search_child, children[0], opponent, depth - 1, -INF)
+        best_score, self.nodes = first.result()
+        best_move = moves[0]
+        futures = [
+            self._pool.submit(search_child, child, opponent, depth - 1, best_score)
+            for child in children[1:]
+        ]
+
+        for move, future in zip(moves[1:], futures):
+            score, nodes = future.result()
+            self.nodes += nodes
+
+            if score > best_score:
+                best_move, best_score = move, score
+
+        self.score = best_score
+        self.completed_depth = depth
+        return best_move
+
+    def _solve(
+        self,
+        solver: EndgameSolver,
+        board: Board,
+        player: Color,
+        deadline: float,
+        max_nodes: float,
+    ) -> Position:
+        """Play the endgame perfectly, reporting the exact final disc difference."""
+        move, score = solver.solve(board, player, deadline, max_nodes)
+        self.nodes = solver.nodes
+        self.completed_depth = board.num_empty
+        self.score = score
+        self.solved = True
+        return move
+
+    def _aspiration(
+        self, board: Board, player: Color, depth: int, previous: float
+    ) -> float:
+        """Search a window around the previous score, widening it on failure."""
+        if self.aspiration is None or abs(previous) == INF:
+            return self._negamax(board, player, depth)
+
+        alpha = previous - self.aspiration
+        beta = previous + self.aspiration
+        score = self._negamax(board, player, depth, alpha, beta)
+
+        if alpha < score < beta:
+            return score
+
+        return self._negamax(board, player, depth)
+
+    def _negamax(
+        self,
+        board: Board,
+        player: Color,
+        depth: int,
+        alpha: float = -INF,
+        beta: float = INF,
+        ply: int = 0,
+    ) -> float:
+        self.nodes += 1
+
+        if self.nodes >= self._max_nodes or (
+            self.nodes & CHECK_INTERVAL == 0 and time.perf_counter() >= self._deadline
+        ):
+            raise BudgetExceeded
+
+        alpha_orig = alpha
+        key, black, white, index = self._key(board, player)
+        node = self._probe(key, black, white)
+
+        # the root is always searched, so its best move comes from this search
+        # rather than from whatever entry the cache keeps for it
+        if ply and node is not None and node.depth >= depth:
+            alpha, beta = narrow(node, alpha, beta)
+
+            if alpha >= beta:
+                return node.score
+
+        opponent = player.opponent
+        player_moves = board.moves(player)
+
+        if player_moves == 0 and board.moves(opponent) != 0:
+            return -self._negamax(board, opponent, depth, -beta, -alpha, ply + 1)
+
+        if depth == 0 or player_moves == 0:
+            return self._evaluate(board, player)
+
+        best_move = -1
+        best_score = -INF
+        moves = self._order(node, board, player, player_moves, ply, index)
+
+        for i, move in enumerate(moves):
+            score = self._search_move(board, player, move, depth, alpha, beta, i, ply)
+
+            if score > best_score:
+                best_move = move
+                best_score = score
+                alpha = max(alpha, score)
+
+                if alpha >= beta:
+                    self.cutoffs += 1
+                    self.first_move_cutoffs += i == 0
+
+                    if self.ordering is not None:
+                        self.ordering.update(move, player, depth, ply)
+
+                    break
+
+        if ply == 0:
+            self._root_move = best_move
+
+        if index and best_move > 0:
+            best_move = transform(best_move, board.size, index)
+
+        flag = bound_flag(best_score, alpha_orig, beta)
+        self._store(key, TreeNode(best_move, best_score, depth, flag, black, white))
+        return best_score
+
+    def _evaluate(self, board: Board, player: Color) -> float:
+        """Score a leaf, counting it when keeping stats."""
+        if self.stats is not None:
+            self.stats.leaf_evals += 1
+
+        return self.scorer(board, player)
+
+    def _order(
+        self,
+        node: TreeNode | None,
+        board: Board,
+        player: Color,
+        player_moves: Position,
+        ply: int,
+        index: int,
+    ) -> Iterable[Position]:
+        """Return the moves in search order, the cached best move first."""
+        if self.ordering is None:
+            return iterate_position(player_moves)
+
+        hash_move = 0
+
+        if node is not None and node.move > 0:
+            hash_move = inverse_transform(node.move, board.size, index)
+
+        return self.ordering.order(player_moves, player, ply, board.size, hash_move)
+
+    def _probe(self, key: int, black: int, white: int) -> TreeNode | None:
+        """Return the cached node of a position, treating collisions as misses."""
+        node = self.cache.get(key)
+        stats = self.stats
+
+        # a colliding position is overwritten when the search stores its result
+        if node is not None and (node.black != black or node.white != white):
+            node = None
+
+            if stats is not None:
+                stats.overwrites += 1
+
+        if stats is not None:
+            stats.probes += 1
+            stats.hits += node is not None
+
+        return node
+
+    def _search_move(
+        self,
+        board: Board,
+        player: Color,
+        move: Position,
+        depth: int,
+        alpha: float,
+        beta: float,
+        i: int,
+        ply: int,
+    ) -> float:
+        """Return the score of the i-th move searched from a position."""
+        opponent = player.opponent
+        flips = board.apply(move, player)
+        depth -= 1
+        ply += 1
+
+        if i == 0 or not self.pvs:
+            score = -self._negamax(board, opponent, depth, -beta, -alpha, ply)
+        else:
+            # prove the move is no better than the first with a null window,
+            # and search it fully only when that fails high
+            score = -self._negamax(board, opponent, depth, -alpha - 1, -alpha, ply)
+
+            if alpha < score < beta:
+                score = -self._negamax(board, opponent, depth, -beta, -alpha, ply)
+
+        board.undo(move, flips, player)
+        return score
+
+    def _store(self, key: int, node: TreeNode) -> None:
+        if self.stats is not None:
+            self.stats.stores += 1
 
-    cache[(board, player)] = TreeNode(best_move, best_score, depth, flag)
-    return best_score
+        self.cache[key] = node
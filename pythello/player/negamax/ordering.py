@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING
+
+from pythello.board import iterate_position
+
+if TYPE_CHECKING:
+    from pythello.board import Color, Position
+
+NUM_KILLERS = 2
+
+# static ranks from best to worst, ties broken by the history table
+CORNER = 0
+EDGE = 1
+INTERIOR = 2
+INNER_RING = 3
+C_SQUARE = 4
+X_SQUARE = 5
+
+
+@cache
+def static_ranks(size: int) -> dict[Position, int]:
+    """Rank every square by how promising a move there usually is."""
+    last = size - 1
+    corners = {(0, 0), (0, last), (last, 0), (last, last)}
+    ranks = {}
+
+    for row in range(size):
+        for col in range(size):
+            near = {
+                (r, c)
+                for r, c in corners
+                if abs(r - row) <= 1 and abs(c - col) <= 1 and (r, c) != (row, col)
+            }
+            on_edge = row in (0, last) or col in (0, last)
+
+            if (row, col) in corners:
+                rank = CORNER
+            elif near and on_edge:
+                rank = C_SQUARE
+            elif near:
+                rank = X_SQUARE
+            elif on_edge:
+                rank = EDGE
+            elif row in (1, last - 1) or col in (1, last - 1):
+                rank = INNER_RING
+            else:
+                rank = INTERIOR
+
+            ranks[1 << (row * size + col)] = rank
+
+    return ranks
+
+
+class MoveOrdering:
+    """Order moves by hash move, killer moves, history and static square rank.
+
+    Killer moves are kept per ply from the root, so that they carry over to
+    the same ply when iterative deepening searches one level deeper.
+    """
+
+    def __init__(self) -> None:
+        self.history: tuple[dict[Position, int], dict[Position, int]] = ({}, {})
+        self.killers: dict[int, list[Position]] = {}
+
+    def new_search(self) -> None:
+        """Age the history table and forget killers from the previous search."""
+        for history in self.history:
+            for move in history:
+                history[move] >>= 1
+
+        self.killers.clear()
+
+    def order(
+        self,
+        moves: Position,
+        player: Color,
+        ply: int,
+        size: int,
+        hash_move: Position = 0,
+    ) -> list[Position]:
+        """Return the moves in the order they should be searched."""
+        history = self.history[player]
+        ranks = static_ranks(size)
+        ordered = sorted(
+            iterate_position(moves), key=lambda m: (-history.get(m, 0), ranks[m])
+        )
+        first = [hash_move] if hash_move > 0 and hash_move & moves else []
+
+        for killer in self.killers.get(ply, ()):
+            if killer & moves and killer not in first:
+                first.append(killer)
+
+        if not first:
+            return ordered
+
+        for move in first:
+            ordered.remove(move)
+
+        return first + ordered
+
+    def update(self, move: Position, player: Color, depth: int, ply: int) -> None:
+        """Record a move that caused a beta cutoff."""
+        history = self.history[player]
+        history[move] = history.get(move, 0) + depth * depth
+        killers = self.killers.setdefault(ply, [])
+
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[NUM_KILLERS:]
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pythello.board import Board, Color
+
+    from .negamax import Negamax
+
+# each worker process keeps its own searcher, and with it its own cache
+_searcher: Negamax | None = None
+
+
+def init_worker(searcher: Negamax) -> None:
+    global _searcher
+    _searcher = searcher
+
+
+def search_child(
+    board: Board, player: Color, depth: int, alpha: float
+) -> tuple[float, int]:
+    """Score a root child from the parent's point of view in a worker process.
+
+    Scores at or below alpha are upper bounds, which is enough to show that the
+    move cannot beat the best one found so far.
+    """
+    if _searcher is None:
+        raise RuntimeError('Worker process was not initialized with a searcher')
+
+    score = -_searcher.evaluate(board, player, depth, beta=-alpha)
+    return score, _searcher.nodes
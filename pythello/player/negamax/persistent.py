@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import time
+from typing import TYPE_CHECKING
+
+from .table import WORD_MASK, TranspositionTable
+
+try:
+    import fcntl
+except ImportError:  # Windows has no advisory locks
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from .tree import TreeNode
+
+MAGIC = b'PYTHTTAB'
+VERSION = 2
+SIGNATURE_BYTES = 32
+HEADER = struct.Struct(f'<8sHHQ{SIGNATURE_BYTES}s12x')
+SCORE = struct.Struct('<d')
+SCORE_BITS = struct.Struct('<Q')
+DEFAULT_FLUSH_INTERVAL = 60.0
+
+# arrays in file order, widest first so every one of them stays aligned
+LAYOUT = (
+    ('_keys', 'Q'),
+    ('_boards', 'Q'),
+    ('_scores', 'd'),
+    ('_checks', 'Q'),
+    ('_moves', 'H'),
+    ('_depths', 'b'),
+    ('_flags', 'B'),
+    ('_generations', 'B'),
+)
+
+
+def checksum(key: int, node: TreeNode) -> int:
+    """Fold a key and everything stored with it into one 64-bit word."""
+    score: int
+    (score,) = SCORE_BITS.unpack(SCORE.pack(node.score))
+    move = node.move.bit_length() if node.move > 0 else 0
+    check = key ^ score ^ move ^ (node.depth & 0xFF) << 16 ^ node.flag.value << 24
+    pieces = node.black ^ (node.white << 1)
+
+    while pieces:
+        check ^= pieces & WORD_MASK
+        pieces >>= 64
+
+    return check
+
+
+class PersistentTable(TranspositionTable):
+    """Transposition table kept in a memory-mapped file and reused across runs.
+
+    Every process maps the file shared, so entries written by one are seen by
+    the others and survive them. Each slot also stores a checksum of its entry,
+    written last, so an entry torn by a concurrent writer reads as a miss rather
+    than as a wrong score. Entries never age: the first slot of a bucket keeps
+    the deepest result seen in any run, and shallower results go to the second.
+
+    The file is recreated when its board size, slot count or signature differ,
+    so the signature should tell apart the scorers the scores came from, as
+    ``scorer_signature`` does. The header keeps a digest of the signature.
+    """
+
+    _checks: memoryview
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        size_mb: float,
+        board_size: int = 8,
+        signature: str = '',
+        flush_interval: float | None = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError('Flush interval must be strictly positive or None')
+
+        self.path = os.fspath(path)
+        self.signature = signature
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        super().__init__(size_mb, board_size)
+        self.loaded = len(self)
+
+    def __reduce__(self) -> tuple[type[PersistentTable], tuple[object, ...]]:
+        # worker processes map the same file rather than receive a copy
+        return PersistentTable, (
+            self.path,
+            self._size_mb,
+            self._board_size,
+            self.signature,
+            self.flush_interval,
+        )
+
+    def _allocate(self, num_slots: int) -> None:
+        counts = {'_boards': num_slots * 2 * self._words}
+        sizes = [
+            struct.calcsize(code) * counts.get(name, num_slots) for name, code in LAYOUT
+        ]
+        total = HEADER.size + sum(sizes)
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            self._board_size,
+            num_slots,
+            hashlib.blake2b(
+                self.signature.encode(), digest_size=SIGNATURE_BYTES
+            ).digest(),
+        )
+
+        with open(self.path, 'a+b') as file:
+            # hold a lock while checking the header so two processes starting
+            # together cannot both recreate the file, and release it by hand
+            # since the mapping keeps a duplicate of the descriptor open
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+
+            try:
+                file.seek(0)
+                fresh = file.read(HEADER.size) != header
+                fresh |= os.fstat(file.fileno()).st_size != total
+
+                if fresh:
+                    file.truncate(0)
+                    file.truncate(total)
+
+                self._mmap = mmap.mmap(file.fileno(), total)
+
+                if fresh:
+                    self._mmap[: HEADER.size] = header
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+
+        if hasattr(mmap, 'MADV_WILLNEED'):
+            self._mmap.madvise(mmap.MADV_WILLNEED)
+
+        self._views = [memoryview(self._mmap)]
+        start = HEADER.size
+
+        for (name, code), size in zip(LAYOUT, sizes):
+            data = self._views[0][start : start + size]
+            # typeshed only accepts a literal format, one overload per item type
+            view = data.cast(code)  # type: ignore[call-overload]
+            self._views.append(view)
+            setattr(self, name, view)
+            start += size
+
+    def _copy_slot(self, source: int, target: int) -> None:
+        super()._copy_slot(source, target)
+        self._checks[target] = self._checks[source]
+
+    def _load(self, slot: int, key: int) -> TreeNode | None:
+        node = super()._load(slot, key)
+
+        if node is None or self._checks[slot] != checksum(key, node):
+            return None
+
+        return node
+
+    def _stale(self, slot: int) -> bool:
+        return False
+
+    def _write(self, slot: int, key: int, value: TreeNode) -> None:
+        super()._write(slot, key, value)
+        self._checks[slot] = checksum(key, value)
+
+    def clear(self) -> None:
+        self._mmap[HEADER.size :] = bytes(len(self._mmap) - HEADER.size)
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def close(self) -> None:
+        """Write pending entries to disk and unmap the file."""
+        self.flush()
+
+        for view in reversed(self._views):
+            view.release()
+
+        self._mmap.close()
+
+    def flush(self) -> None:
+        """Write the entries changed in memory back to the file."""
+        self._mmap.flush()
+        self._last_flush = time.monotonic()
+
+    def new_search(self) -> None:
+        """Start a new search, flushing to disk once the interval has passed."""
+        super().new_search()
+
+        if (
+            self.flush_interval is not None
+            and time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    @property
+    def occupancy(self) -> float:
+        """Return the fraction of slots holding an entry from any run."""
+        return len(self) / len(self._flags)
+
+    def resize(self, board_size: int) -> PersistentTable:
+        """Reopen the file for another board size, discarding its entries."""
+        self.close()
+        return PersistentTable(
+            self.path,
+            self._size_mb,
+            board_size,
+            self.signature,
+            self.flush_interval,
+        )
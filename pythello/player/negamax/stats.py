@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, NamedTuple
+
+from .table import TranspositionTable
+
+if TYPE_CHECKING:
+    from .negamax import Negamax
+
+
+class DepthStats(NamedTuple):
+    depth: int
+    nodes: int
+    seconds: float
+
+
+class SearchStats:
+    """Counters of the last search of a ``Negamax`` created with stats enabled.
+
+    Cache counters cover the heuristic search only: an endgame solve or a
+    parallel search reports its nodes and time but nothing the workers or the
+    solver saw. Overwrites count stored entries that replaced another position,
+    whether a colliding key or an entry evicted from a transposition table.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.as_dict()})'
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            'nodes': self.nodes,
+            'leaf_evals': self.leaf_evals,
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hit_rate,
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoffs': self.first_move_cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoff_rate,
+            'branching_factor': self.branching_factor,
+            'seconds': self.seconds,
+            'depths': [depth._asdict() for depth in self.depths],
+        }
+
+    @property
+    def branching_factor(self) -> float:
+        """Return the effective branching factor of the search.
+
+        With several iterations this is the growth in nodes from the second to
+        last iteration to the last, and otherwise the root of the node count to
+        the depth searched.
+        """
+        if len(self.depths) >= 2 and self.depths[-2].nodes:
+            return self.depths[-1].nodes / self.depths[-2].nodes
+
+        if self.depths and self.depths[-1].depth:
+            return float(self.depths[-1].nodes ** (1 / self.depths[-1].depth))
+
+        return 0.0
+
+    def finish(self, searcher: Negamax, seconds: float) -> None:
+        """Collect the counters the searcher keeps itself once a search ends."""
+        self.nodes = searcher.nodes
+        self.cutoffs = searcher.cutoffs
+        self.first_move_cutoffs = searcher.first_move_cutoffs
+        self.seconds = seconds
+
+        if isinstance(searcher.cache, TranspositionTable):
+            # a table resized for another board size starts counting afresh
+            base = self._table_overwrites if searcher.cache is self._table else 0
+            self.overwrites += searcher.cache.overwrites - base
+
+        if not self.depths and searcher.completed_depth:
+            depth = DepthStats(searcher.completed_depth, self.nodes, seconds)
+            self.depths.append(depth)
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """Return the fraction of beta cutoffs caused by the first move searched."""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def reset(self, searcher: Negamax | None = None) -> None:
+        """Zero every counter before a search by the given searcher."""
+        self.nodes = 0
+        self.leaf_evals = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.seconds = 0.0
+        self.depths: list[DepthStats] = []
+        self._table: TranspositionTable | None = None
+        self._table_overwrites = 0
+
+        if searcher is not None and isinstance(searcher.cache, TranspositionTable):
+            self._table = searcher.cache
+            self._table_overwrites = searcher.cache.overwrites
+
+    def to_json(self, indent: int | None = None) -> str:
+        return json.dumps(self.as_dict(), indent=indent)
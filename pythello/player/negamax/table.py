@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, MutableMapping
+from typing import TypeVar, overload
+
+from .tree import TreeFlag, TreeNode
+
+T = TypeVar('T')
+
+BUCKET_SIZE = 2
+FLAGS = {flag.value: flag for flag in TreeFlag}
+WORD_BITS = 64
+WORD_MASK = (1 << WORD_BITS) - 1
+
+# bytes per slot excluding the board: key, move, score, depth, flag and generation
+SLOT_BYTES = 8 + 2 + 8 + 1 + 1 + 1
+
+
+class TranspositionTable(MutableMapping[int, TreeNode]):
+    """Fixed-memory transposition table backed by preallocated arrays.
+
+    Slots are grouped in buckets of two: the first keeps the deepest result seen
+    for the current search and the second is always replaced. A generation
+    counter, bumped by ``new_search``, lets entries from earlier searches be
+    overwritten without clearing the table.
+    """
+
+    def __init__(self, size_mb: float, board_size: int = 8) -> None:
+        if size_mb <= 0:
+            raise ValueError('Table size must be strictly positive')
+
+        self._size_mb = size_mb
+        self._board_size = board_size
+        self._words = -(-(board_size**2) // WORD_BITS)
+        slot_bytes = SLOT_BYTES + 2 * 8 * self._words
+        num_buckets = int(size_mb * 2**20) // (slot_bytes * BUCKET_SIZE)
+
+        if num_buckets <= 0:
+            raise ValueError(
+                f'Table size must hold at least one bucket of {BUCKET_SIZE}'
+            )
+
+        # power-of-two bucket count so the index is a mask rather than a modulo
+        self._num_buckets = 1 << (num_buckets.bit_length() - 1)
+        self._bucket_mask = self._num_buckets - 1
+        self._generation = 0
+        self._allocate(self._num_buckets * BUCKET_SIZE)
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def __delitem__(self, key: int) -> None:
+        slot = self._find(key)
+
+        if slot < 0:
+            raise KeyError(key)
+
+        # both slots of a bucket hold the key when a shallower result was kept
+        while slot >= 0:
+            self._flags[slot] = 0
+            slot = self._find(key)
+
+    def __getitem__(self, key: int) -> TreeNode:
+        node = self.get(key)
+
+        if node is None:
+            raise KeyError(key)
+
+        return node
+
+    def __iter__(self) -> Iterator[int]:
+        for slot, flag in enumerate(self._flags):
+            if flag and self._find(self._keys[slot]) == slot:
+                yield self._keys[slot]
+
+    def __len__(self) -> int:
+        keys, flags = self._keys, self._flags
+        duplicates = sum(
+            1
+            for first, second, first_flag, second_flag in zip(
+                keys[::2], keys[1::2], flags[::2], flags[1::2]
+            )
+            if first == second and first_flag and second_flag
+        )
+        return len(flags) - bytes(flags).count(0) - duplicates
+
+    def __repr__(self) -> str:
+        return (
+            f'{self.__class__.__name__}(slots={len(self._keys)}, '
+            f'occupancy={self.occupancy:.1%}, hit_rate={self.hit_rate:.1%})'
+        )
+
+    def __setitem__(self, key: int, value: TreeNode) -> None:
+        bucket = (key & self._bucket_mask) * BUCKET_SIZE
+        slot = bucket + 1
+
+        if self._keys[bucket] == key and self._flags[bucket]:
+            # a shallower result for the same position leaves the deeper one
+            if value.depth >= self._depths[bucket] or self._stale(bucket):
+                slot = bucket
+        elif self._keys[slot] == key and self._flags[slot]:
+            if value.depth >= self._depths[bucket] or self._stale(bucket):
+                # the entry displaced from the first slot takes the one freed
+                self._copy_slot(bucket, slot)
+                self._flags[bucket] = 0
+                slot = bucket
+        elif (
+            not self._flags[bucket]
+            or value.depth >= self._depths[bucket]
+            or self._stale(bucket)
+        ):
+            # the displaced entry drops to the always-replace slot
+            if self._flags[bucket]:
+                self.overwrites += self._flags[slot] != 0
+                self._copy_slot(bucket, slot)
+                self._flags[bucket] = 0
+
+            slot = bucket
+
+        if self._flags[slot] and self._keys[slot] != key:
+            self.overwrites += 1
+
+        self.stores += 1
+        self._write(slot, key, value)
+
+    def _allocate(self, num_slots: int) -> None:
+        self._keys = array('Q', [0]) * num_slots
+        self._boards = array('Q', [0]) * (num_slots * 2 * self._words)
+        self._moves = array('H', [0]) * num_slots
+        self._scores = array('d', [0.0]) * num_slots
+        self._depths = array('b', [0]) * num_slots
+        self._flags = array('B', [0]) * num_slots
+        self._generations = array('B', [0]) * num_slots
+
+    def _copy_slot(self, source: int, target: int) -> None:
+        for table in (
+            self._keys,
+            self._moves,
+            self._depths,
+            self._flags,
+            self._generations,
+        ):
+            table[target] = table[source]
+
+        self._scores[target] = self._scores[source]
+
+        words = 2 * self._words
+        start = source * words
+        self._boards[target * words : (target + 1) * words] = self._boards[
+            start : start + words
+        ]
+
+    def _find(self, key: int) -> int:
+        bucket = (key & self._bucket_mask) * BUCKET_SIZE
+
+        for slot in range(bucket, bucket + BUCKET_SIZE):
+            if self._keys[slot] == key and self._flags[slot]:
+                return slot
+
+        return -1
+
+    def _load(self, slot: int, key: int) -> TreeNode | None:
+        move = self._moves[slot]
+        black, white = self._load_board(slot)
+        return TreeNode(
+            1 << (move - 1) if move else -1,
+            self._scores[slot],
+            self._depths[slot],
+            FLAGS[self._flags[slot]],
+            black,
+            white,
+        )
+
+    def _load_board(self, slot: int) -> tuple[int, int]:
+        words = self._words
+        start = slot * 2 * words
+        black = white = 0
+
+        for i in range(words):
+            black |= self._boards[start + i] << (i * WORD_BITS)
+            white |= self._boards[start + words + i] << (i * WORD_BITS)
+
+        return black, white
+
+    def _stale(self, slot: int) -> bool:
+        return self._generations[slot] != self._generation
+
+    def _store_board(self, slot: int, black: int, white: int) -> None:
+        words = self._words
+        start = slot * 2 * words
+
+        for i in range(words):
+            self._boards[start + i] = (black >> (i * WORD_BITS)) & WORD_MASK
+            self._boards[start + words + i] = (white >> (i * WORD_BITS)) & WORD_MASK
+
+    def _write(self, slot: int, key: int, value: TreeNode) -> None:
+        self._keys[slot] = key
+        self._moves[slot] = value.move.bit_length() if value.move > 0 else 0
+        self._scores[slot] = value.score
+        self._depths[slot] = value.depth
+        self._flags[slot] = value.flag.value
+        self._generations[slot] = self._generation
+        self._store_board(slot, value.black, value.white)
+
+    @property
+    def board_size(self) -> int:
+        return self._board_size
+
+    def clear(self) -> None:
+        for table in (self._keys, self._moves, self._depths, self._flags):
+            table[:] = array(table.typecode, [0]) * len(table)
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    @overload
+    def get(self, key: int, /) -> TreeNode | None:
+        ...
+
+    @overload
+    def get(self, key: int, default: TreeNode | T, /) -> TreeNode | T:
+        ...
+
+    def get(self, key: int, default: object = None) -> object:
+        self.probes += 1
+        slot = self._find(key)
+        node = self._load(slot, key) if slot >= 0 else None
+
+        if node is None:
+            return default
+
+        self.hits += 1
+        return node
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def new_search(self) -> None:
+        """Start a new search so entries from earlier searches can be replaced."""
+        self._generation = (self._generation + 1) & 0xFF
+
+    def resize(self, board_size: int) -> TranspositionTable:
+        """Return an empty table of the same memory budget for another board size."""
+        return TranspositionTable(self._size_mb, board_size)
+
+    @property
+    def occupancy(self) -> float:
+        """Return the fraction of slots holding an entry from the current search."""
+        current = sum(
+            1
+            for flag, generation in zip(self._flags, self._generations)
+            if flag and generation == self._generation
+        )
+        return current / len(self._flags)
@@ -6,6 +6,13 @@ from typing import TYPE_CHECKING, NamedTuple
 if TYPE_CHECKING:
     from pythello.board import Position
 
+# number of nodes between clock checks, minus one so it can be used as a mask
+CHECK_INTERVAL = (1 << 6) - 1
+
+
+class BudgetExceeded(Exception):
+    """Raised inside a search when the time or node budget runs out."""
+
 
 class TreeFlag(Enum):
     LOWER = 1
@@ -18,3 +25,27 @@ class TreeNode(NamedTuple):
     score: float
     depth: int
     flag: TreeFlag
+    black: int
+    white: int
+
+
+def bound_flag(score: float, alpha: float, beta: float) -> TreeFlag:
+    """Return what a score found within a window says about the exact score."""
+    if score <= alpha:
+        return TreeFlag.UPPER
+
+    if score >= beta:
+        return TreeFlag.LOWER
+
+    return TreeFlag.EXACT
+
+
+def narrow(node: TreeNode, alpha: float, beta: float) -> tuple[float, float]:
+    """Narrow a window by a cached score, which an exact score closes."""
+    if node.flag is not TreeFlag.UPPER:
+        alpha = max(alpha, node.score)
+
+    if node.flag is not TreeFlag.LOWER:
+        beta = min(beta, node.score)
+
+    return alpha, beta
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import random
 from collections.abc import Callable
-from enum import Enum
 
-from pythello.board import Position
+from pythello.board import Position, iterate_position
 from pythello.game import Game
+from pythello.pickling import PickleByName
 from pythello.player.greedy import greedy_move
 from pythello.player.heuristic import Heuristic
+from pythello.player.mcts import MCTS
 from pythello.player.negamax import Negamax
 from pythello.score import Score
 
@@ -22,10 +23,20 @@ class PlayerWrapper:
     def __call__(self, game: Game) -> Position:
         return self._player(game)
 
+    def reset(self) -> None:
+        reset = getattr(self._player, 'reset', None)
 
-class AI(PlayerWrapper, Enum):
-    RANDOM = PlayerWrapper(lambda game: random.choice(list(game.valid)))
+        if callable(reset):
+            reset()
+
+
+class AI(PlayerWrapper, PickleByName):
+    RANDOM = PlayerWrapper(
+        lambda game: random.choice(list(iterate_position(game.moves)))
+    )
     GREEDY = PlayerWrapper(greedy_move)
     EDGE = Heuristic(Score.EDGE)
     BALANCED = Heuristic(Score.BALANCED)
     NEGAMAX = Negamax(Score.BALANCED)
+    NEGAMAX_TIMED = Negamax(Score.BALANCED, depth=None, time_limit=1.0)
+    MCTS = MCTS(Score.BALANCED, playouts=None, time_limit=1.0)
@@ -1,4 +1,12 @@
-from .score import Score, Scorer
+from .pattern import PatternScore
+from .score import Score, Scorer, ScorerWrapper, scorer_signature
 from .weighted import WeightedScore
 
-__all__ = ['Score', 'Scorer', 'WeightedScore']
+__all__ = [
+    'PatternScore',
+    'Score',
+    'Scorer',
+    'ScorerWrapper',
+    'WeightedScore',
+    'scorer_signature',
+]
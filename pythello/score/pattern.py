@@ -0,0 +1,243 @@
+"""Evaluate 8x8 positions with lookup tables indexed by disc patterns.
+
+Each pattern is a fixed set of squares read in base 3 (empty, player,
+opponent), and every symmetric copy of a pattern on the board indexes the same
+table. The copies are read from the top left corner of the eight symmetric
+copies of the bitboards, so a single extraction per pattern covers them all.
+Tables are kept per game phase, chosen by the number of empty squares.
+"""
+from __future__ import annotations
+
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import TYPE_CHECKING, NamedTuple
+
+from pythello.board.symmetry import inverse_transform
+
+if TYPE_CHECKING:
+    from pythello.board import Board, Color
+
+SIZE = 8
+FULL_MASK = (1 << SIZE**2) - 1
+MAX_EMPTY = SIZE**2 - 4
+DEFAULT_PHASES = 6
+
+MAGIC = b'PYTHPATT'
+VERSION = 1
+HEADER = struct.Struct('<8sHHI4x')  # magic, version, phases, weights per phase
+
+DIAGONAL = 0x8040201008040201
+COLLECT = 0x0101010101010101
+REVERSE_BITS = bytes(int(f'{byte:08b}'[::-1], 2) for byte in range(256))
+
+# squares of each pattern in its top left copy, read from the lowest bit
+EDGE = tuple(range(SIZE))
+CORNER_3X3 = tuple(row * SIZE + col for row in range(3) for col in range(3))
+CORNER_2X5 = tuple(row * SIZE + col for row in range(2) for col in range(5))
+DIAGONAL_SQUARES = tuple(i * SIZE + i for i in range(SIZE))
+
+# classic positional square values, used to seed untrained tables
+SQUARE_VALUES = (
+    (100, -20, 10, 5, 5, 10, -20, 100),
+    (-20, -50, -2, -2, -2, -2, -50, -20),
+    (10, -2, -1, -1, -1, -1, -2, 10),
+    (5, -2, -1, -1, -1, -1, -2, 5),
+    (5, -2, -1, -1, -1, -1, -2, 5),
+    (10, -2, -1, -1, -1, -1, -2, 10),
+    (-20, -50, -2, -2, -2, -2, -50, -20),
+    (100, -20, 10, 5, 5, 10, -20, 100),
+)
+
+
+class Pattern(NamedTuple):
+    name: str
+    squares: tuple[int, ...]
+    transforms: tuple[int, ...]
+
+    @property
+    def table_size(self) -> int:
+        return int(3 ** len(self.squares))
+
+
+# the transforms whose top left copy of a pattern lands on a distinct set of
+# squares, numbered as in pythello.board.symmetry
+PATTERNS = (
+    Pattern('edge', EDGE, (0, 2, 4, 6)),
+    Pattern('corner 3x3', CORNER_3X3, (0, 1, 2, 3)),
+    Pattern('corner 2x5', CORNER_2X5, tuple(range(8))),
+    Pattern('diagonal', DIAGONAL_SQUARES, (0, 1)),
+)
+OFFSETS = tuple(accumulate((pattern.table_size for pattern in PATTERNS), initial=0))
+PHASE_SIZE = OFFSETS[-1]
+
+# base 3 value of every compact bit pattern, doubled for the opponent's discs
+TERNARY = tuple(
+    sum(3**i for i in range(10) if bits >> i & 1) for bits in range(1 << 10)
+)
+TERNARY_2 = tuple(2 * value for value in TERNARY)
+
+
+def flip_diagonal(x: int) -> int:
+    """Transpose an 8x8 bitboard with three delta swaps."""
+    t = 0x0F0F0F0F00000000 & (x ^ (x << 28))
+    x ^= t ^ (t >> 28)
+    t = 0x3333000033330000 & (x ^ (x << 14))
+    x ^= t ^ (t >> 14)
+    t = 0x5500550055005500 & (x ^ (x << 7))
+    return x ^ t ^ (t >> 7)
+
+
+def square_coverage() -> list[int]:
+    """Count how many pattern copies cover each square of the board."""
+    coverage = [0] * SIZE**2
+
+    for pattern in PATTERNS:
+        for index in pattern.transforms:
+            for square in pattern.squares:
+                bit = inverse_transform(1 << square, SIZE, index)
+                coverage[bit.bit_length() - 1] += 1
+
+    return coverage
+
+
+def variants(x: int) -> tuple[int, ...]:
+    """Return the eight symmetric copies of an 8x8 bitboard by transform number.
+
+    Rows are bytes, so mirroring reverses the bits of each byte and flipping
+    reverses the bytes, both done in C.
+    """
+    from_bytes = int.from_bytes
+    t = flip_diagonal(x)
+    row_bytes = x.to_bytes(8, 'little')
+    column_bytes = t.to_bytes(8, 'little')
+    mirrored = row_bytes.translate(REVERSE_BITS)
+    transposed_mirrored = column_bytes.translate(REVERSE_BITS)
+    return (
+        x,
+        from_bytes(mirrored, 'little'),
+        from_bytes(row_bytes, 'big'),
+        from_bytes(mirrored, 'big'),
+        t,
+        from_bytes(transposed_mirrored, 'little'),
+        from_bytes(column_bytes, 'big'),
+        from_bytes(transposed_mirrored, 'big'),
+    )
+
+
+class PatternScore:
+    """Score a position by summing pattern table weights for the side to move.
+
+    Only 8x8 boards are supported. Game-over positions are scored like any
+    other, so wrap the scorer in ``ScorerWrapper`` to reward won games.
+    """
+
+    def __init__(self, weights: array[float], num_phases: int) -> None:
+        if num_phases <= 0:
+            raise ValueError('Number of phases must be strictly positive')
+
+        if len(weights) != num_phases * PHASE_SIZE:
+            raise ValueError(f'Expected {num_phases * PHASE_SIZE} weights')
+
+        self.weights = weights
+        self.num_phases = num_phases
+
+    def __call__(self, board: Board, player: Color) -> float:
+        if board.size != SIZE:
+            raise ValueError(f'Pattern scores only support {SIZE}x{SIZE} boards')
+
+        current = board.players[player]
+        opponent = board.players[player.opponent]
+        empty = ((current | opponent) ^ FULL_MASK).bit_count()
+        base = min(empty, MAX_EMPTY) * self.num_phases // (MAX_EMPTY + 1) * PHASE_SIZE
+        weights = self.weights
+        ternary = TERNARY
+        ternary_2 = TERNARY_2
+        own = variants(current)
+        other = variants(opponent)
+        score = 0.0
+
+        edge = base + OFFSETS[0]
+        corner_3x3 = base + OFFSETS[1]
+        corner_2x5 = base + OFFSETS[2]
+
+        for index, (x, y) in enumerate(zip(own, other)):
+            score += weights[
+                corner_2x5
+                + ternary[(x & 0x1F) | (x >> 3 & 0x3E0)]
+                + ternary_2[(y & 0x1F) | (y >> 3 & 0x3E0)]
+            ]
+
+            if index < 4:
+                score += weights[
+                    corner_3x3
+                    + ternary[(x & 0x7) | (x >> 5 & 0x38) | (x >> 10 & 0x1C0)]
+                    + ternary_2[(y & 0x7) | (y >> 5 & 0x38) | (y >> 10 & 0x1C0)]
+                ]
+
+            if not index & 1:
+                score += weights[edge + ternary[x & 0xFF] + ternary_2[y & 0xFF]]
+
+        diagonal = base + OFFSETS[3]
+
+        for index in (0, 1):
+            # multiplying gathers one bit of each row into the top byte
+            x = (own[index] & DIAGONAL) * COLLECT >> 56 & 0xFF
+            y = (other[index] & DIAGONAL) * COLLECT >> 56 & 0xFF
+            score += weights[diagonal + ternary[x] + ternary_2[y]]
+
+        return score
+
+    @classmethod
+    def initial(cls, num_phases: int = DEFAULT_PHASES) -> PatternScore:
+        """Seed every phase with the classic square values.
+
+        Each square's value is split evenly over the pattern copies covering
+        it, so the untrained score equals the positional square table over the
+        covered squares.
+        """
+        coverage = square_coverage()
+        tables = []
+
+        for pattern in PATTERNS:
+            table = [0.0]
+
+            for square in pattern.squares:
+                value = SQUARE_VALUES[square // SIZE][square % SIZE] / coverage[square]
+                table = [t + d for d in (0.0, value, -value) for t in table]
+
+            tables += table
+
+        return cls(array('f', tables) * num_phases, num_phases)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> PatternScore:
+        """Read pattern weights written by ``save``."""
+        with open(path, 'rb') as file:
+            magic, version, num_phases, phase_size = HEADER.unpack(
+                file.read(HEADER.size)
+            )
+
+            if magic != MAGIC or version != VERSION or phase_size != PHASE_SIZE:
+                raise ValueError(f'Not a version {VERSION} pattern file: {path}')
+
+            weights = array('f')
+            weights.fromfile(file, num_phases * PHASE_SIZE)
+
+        if sys.byteorder != 'little':
+            weights.byteswap()
+
+        return cls(weights, num_phases)
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Write the weights as little-endian 32-bit floats after a header."""
+        weights = array('f', self.weights)
+
+        if sys.byteorder != 'little':
+            weights.byteswap()
+
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.num_phases, PHASE_SIZE))
+            weights.tofile(file)
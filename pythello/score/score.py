@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from enum import Enum
 
-from pythello.board import Board, Color
+from pythello.board import NUM_FEATURES, Board, Color, Feature
+from pythello.pickling import PickleByName
 from pythello.score.weighted import WeightedScore
 
 Scorer = Callable[[Board, Color], float]
 WIN_BONUS = 1 << 10
+MOBILITY = Feature.MOBILITY
+OPPONENT_MOBILITY = Feature.MOBILITY + NUM_FEATURES
 
 
 class ScorerWrapper:
@@ -15,16 +17,43 @@ class ScorerWrapper:
         self._scorer = scorer
 
     def __call__(self, board: Board, player: Color) -> float:
-        player_moves = board.valid_moves(player)
-        opponent_moves = board.valid_moves(player.opponent)
+        if isinstance(self._scorer, WeightedScore) and self._scorer.fused:
+            # the feature pass already counts the moves of both players
+            features = board.features(player)
 
-        if len(player_moves) == 0 and len(opponent_moves) == 0:
+            if features[MOBILITY] == 0 and features[OPPONENT_MOBILITY] == 0:
+                return board.score(player) * WIN_BONUS
+
+            return self._scorer.evaluate(board, player, features)
+
+        if not board.has_moves(player) and not board.has_moves(player.opponent):
             return board.score(player) * WIN_BONUS
 
         return self._scorer(board, player)
 
+    @property
+    def scorer(self) -> Scorer:
+        """Return the scorer called on positions where the game is not over."""
+        return self._scorer
+
+
+def scorer_signature(scorer: Scorer) -> str:
+    """Return a name for a scorer that differs whenever its scores may differ.
+
+    Weighted scores are named by their weights, and other scorers by their name.
+    """
+    name: str = getattr(scorer, 'name', type(scorer).__name__)
+
+    if isinstance(scorer, ScorerWrapper):
+        scorer = scorer.scorer
+
+    if isinstance(scorer, WeightedScore):
+        return scorer.signature
+
+    return name
+
 
-class Score(ScorerWrapper, Enum):
+class Score(ScorerWrapper, PickleByName):
     GREEDY = ScorerWrapper(lambda board, player: board.score(player))
     EDGE = WeightedScore(
         {
@@ -37,7 +66,7 @@ class Score(ScorerWrapper, Enum):
         {
             Board.player_corners: 16,
             Board.player_edges: 4,
-            lambda board, player: len(board.valid_moves(player)): 2,
+            Board.num_moves: 2,
             Board.player_interior: 1,
             Board.player_frontier: -1,
         }
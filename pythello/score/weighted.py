@@ -1,19 +1,115 @@
 from __future__ import annotations
 
+import json
+import os
+from operator import mul
 from typing import TYPE_CHECKING
 
+from pythello.board import NUM_FEATURES, Board, Feature
+
 if TYPE_CHECKING:
-    from pythello.board import Board, Color
+    from pythello.board import Color
     from pythello.score import Scorer
 
+# board methods counted by Board.features, so they cost nothing extra to score
+FEATURES: dict[Scorer, Feature] = {
+    Board.player_corners: Feature.CORNERS,
+    Board.player_edges: Feature.EDGES,
+    Board.player_interior: Feature.INTERIOR,
+    Board.player_frontier: Feature.FRONTIER,
+    Board.num_moves: Feature.MOBILITY,
+}
+
 
 class WeightedScore:
+    """Score a position as a weighted sum of feature differences.
+
+    Weights of scorers found in ``Board.features`` are folded into one weight
+    vector, so those features are scored as a single dot product over the
+    feature vector. Any other scorer is called for both players.
+
+    The single pass floods the lines of both players, which only mobility
+    needs, so scores that do not weigh mobility call each scorer instead.
+    """
+
     def __init__(self, scorers: dict[Scorer, float]) -> None:
         self.scorers = scorers.copy()
+        weights = [0.0] * NUM_FEATURES
+        self._others: dict[Scorer, float] = {}
+
+        for scorer, weight in scorers.items():
+            if scorer in FEATURES:
+                weights[FEATURES[scorer]] += weight
+            else:
+                self._others[scorer] = weight
+
+        self.weights = tuple(weights) + tuple(-weight for weight in weights)
+        self.fused = weights[Feature.MOBILITY] != 0
 
     def __call__(self, board: Board, player: Color) -> float:
+        if self.fused:
+            return self.evaluate(board, player, board.features(player))
+
         opponent = player.opponent
         return sum(
             (scorer(board, player) - scorer(board, opponent)) * weight
             for scorer, weight in self.scorers.items()
         )
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> WeightedScore:
+        """Read weights written by ``save``, keyed by ``Board`` method name."""
+        with open(path) as file:
+            weights = json.load(file)
+
+        scorers = {}
+
+        for name, weight in weights.items():
+            scorer = getattr(Board, name, None)
+
+            if not callable(scorer):
+                raise ValueError(f'Board has no feature named {name!r}')
+
+            scorers[scorer] = float(weight)
+
+        return cls(scorers)
+
+    @property
+    def signature(self) -> str:
+        """Return the weights as JSON, which tell apart the scores they give."""
+        weights: dict[str, float] = {}
+
+        for scorer, weight in self.scorers.items():
+            name = getattr(scorer, '__qualname__', repr(scorer))
+            weights[name] = weights.get(name, 0.0) + float(weight)
+
+        return json.dumps(weights, sort_keys=True)
+
+    def evaluate(self, board: Board, player: Color, features: tuple[int, ...]) -> float:
+        """Score a position given the feature vector already counted for it."""
+        score = sum(map(mul, features, self.weights))
+
+        if self._others:
+            opponent = player.opponent
+            score += sum(
+                (scorer(board, player) - scorer(board, opponent)) * weight
+                for scorer, weight in self._others.items()
+            )
+
+        return float(score)
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Write the weights as JSON, naming each scorer after its method."""
+        weights = {}
+
+        for scorer, weight in self.scorers.items():
+            name = getattr(scorer, '__name__', '')
+
+            if getattr(Board, name, None) is not scorer:
+                raise ValueError(f'Only Board methods can be saved, not {scorer}')
+
+            weights[name] = weight
+
+        with open(path, 'w') as file:
+            json.dump(weights, file, indent=4)
+            file.write('\n')
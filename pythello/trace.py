@@ -0,0 +1,142 @@
+"""Trace the latency of every move of a game or a series.
+
+``Game`` calls a tracer with a ``MoveRecord`` after each move and each pass,
+timing the whole of ``Game.move`` including the player's call. ``MoveTrace``
+keeps the latest records in a ring buffer and summarizes or dumps them.
+"""
+from __future__ import annotations
+
+import csv
+import math
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, NamedTuple, TextIO
+
+from pythello.board import Color
+
+if TYPE_CHECKING:
+    from pythello.game import AssignedPlayer
+
+DEFAULT_CAPACITY = 1 << 16
+# histogram buckets double from the first upper bound, in seconds
+FIRST_BUCKET = 1e-5
+NUM_BUCKETS = 24
+
+
+class MoveRecord(NamedTuple):
+    color: Color
+    ply: int
+    empties: int
+    branching: int
+    duration: float
+
+    @property
+    def passed(self) -> bool:
+        return self.branching == 0
+
+
+class LatencySummary(NamedTuple):
+    moves: int
+    passes: int
+    p50: float
+    p99: float
+    max: float
+    total: float
+
+
+Tracer = Callable[[MoveRecord], None]
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    if not ordered:
+        return 0.0
+
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class MoveTrace:
+    """Ring buffer of the latest move records, usable as a ``Game`` tracer."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity <= 0:
+            raise ValueError('Capacity must be strictly positive')
+
+        self.records: deque[MoveRecord] = deque(maxlen=capacity)
+
+    def __call__(self, record: MoveRecord) -> None:
+        self.records.append(record)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def by_player(
+        self, players: Iterable[AssignedPlayer]
+    ) -> dict[AssignedPlayer, LatencySummary]:
+        """Summarize the records of each player by the color they play."""
+        return {player: self.summary(player.color) for player in players}
+
+    def clear(self) -> None:
+        self.records.clear()
+
+    def extend(self, records: Iterable[MoveRecord]) -> None:
+        self.records.extend(records)
+
+    def histogram(self, color: Color | None = None) -> list[tuple[float, int]]:
+        """Count move durations in buckets doubling in size, by upper bound.
+
+        The last bucket also holds every longer move, and passes are left out.
+        """
+        counts = [0] * NUM_BUCKETS
+
+        for record in self.records:
+            if record.passed or (color is not None and record.color is not color):
+                continue
+
+            bucket = math.ceil(math.log2(max(record.duration / FIRST_BUCKET, 1)))
+            counts[min(bucket, NUM_BUCKETS - 1)] += 1
+
+        return [(FIRST_BUCKET * 2**i, count) for i, count in enumerate(counts)]
+
+    def summary(self, color: Color | None = None) -> LatencySummary:
+        """Return the latency percentiles and pass count of one or both colors."""
+        durations = []
+        passes = 0
+
+        for record in self.records:
+            if color is not None and record.color is not color:
+                continue
+
+            if record.passed:
+                passes += 1
+            else:
+                durations.append(record.duration)
+
+        durations.sort()
+        return LatencySummary(
+            len(durations),
+            passes,
+            percentile(durations, 0.5),
+            percentile(durations, 0.99),
+            durations[-1] if durations else 0.0,
+            sum(durations),
+        )
+
+    def write_csv(self, file: TextIO) -> None:
+        """Write one row per record, with a header row."""
+        writer = csv.writer(file)
+        writer.writerow(MoveRecord._fields)
+
+        for record in self.records:
+            writer.writerow((record.color.name.lower(), *record[1:]))
+
+    def write_histogram(self, file: TextIO) -> None:
+        """Write the non-empty buckets of both colors, one row per bucket."""
+        writer = csv.writer(file)
+        writer.writerow(('upper_bound', *(color.name.lower() for color in Color)))
+        columns = [self.histogram(color) for color in Color]
+
+        for rows in zip(*columns):
+            if any(count for _, count in rows):
+                writer.writerow((f'{rows[0][0]:.6g}', *(count for _, count in rows)))
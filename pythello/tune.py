@@ -0,0 +1,379 @@
+"""Tune ``WeightedScore`` weights on positions labeled by how their game ended.
+
+Positions are recorded from batched self-play into position files, which are
+memory-mapped and streamed in chunks, so datasets larger than memory can be
+tuned. Feature differences are counted once with NumPy into a scratch file,
+then every epoch fits the weights in the manner of Texel tuning: the score of a
+position, scaled by a constant fitted beforehand, is squashed by a logistic
+function into an expected result, and the squared error against the actual
+result of the game is minimized by gradient descent.
+
+Record and tune from the command line with::
+
+    python -m pythello.tune record games.pos 100000
+    python -m pythello.tune fit weights.json games.pos --epochs 20
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import struct
+import tempfile
+import time
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+
+from pythello.batch import MAX_SIZE, BatchGames, popcount
+from pythello.board import NUM_FEATURES, Color, Feature
+from pythello.player import AI
+from pythello.score import Score, WeightedScore
+from pythello.score.weighted import FEATURES
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+MAGIC = b'PYTHPOSN'
+VERSION = 1
+HEADER = struct.Struct('<8sHH4x')  # magic, version, board size
+POSITION = np.dtype(
+    [('black', '<u8'), ('white', '<u8'), ('player', 'u1'), ('result', 'i1')]
+)
+
+DEFAULT_BATCH = 4096
+DEFAULT_CHUNK = 1 << 16
+DEFAULT_STEP = 1024
+DEFAULT_EPOCHS = 10
+DEFAULT_LEARNING_RATE = 0.01
+# decay rates of the gradient averages kept by Adam
+BETA_1 = 0.9
+BETA_2 = 0.999
+EPSILON = 1e-8
+# scaling constants tried when fitting the logistic to the starting weights
+SCALES = np.logspace(-4, 1, 101)
+
+# the tuned weight of each feature goes to the first scorer counting it
+SCORERS = {feature: scorer for scorer, feature in reversed(FEATURES.items())}
+BALANCED = cast(WeightedScore, Score.BALANCED.scorer)
+
+
+def fit_scale(
+    scores: NDArray[np.float64], results: NDArray[np.float64]
+) -> tuple[float, float]:
+    """Return the scale whose logistic of the scores best fits the results.
+
+    The mean squared error at that scale is returned with it.
+    """
+    expected = sigmoid(np.outer(scores, SCALES))
+    losses = ((expected - results[:, None]) ** 2).mean(axis=0)
+    index = np.argmin(losses)
+    return float(SCALES[index]), float(losses[index])
+
+
+def read_header(path: str | os.PathLike[str]) -> int:
+    """Check the header of a position file and return its board size."""
+    with open(path, 'rb') as file:
+        magic, version, size = HEADER.unpack(file.read(HEADER.size))
+
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'Not a version {VERSION} position file: {path}')
+
+    return int(size)
+
+
+def read_positions(
+    paths: Sequence[str | os.PathLike[str]], chunk_size: int = DEFAULT_CHUNK
+) -> Iterator[tuple[int, NDArray[np.void]]]:
+    """Yield the board size and chunks of positions of every file in turn."""
+    for path in paths:
+        size = read_header(path)
+        count = (os.path.getsize(path) - HEADER.size) // POSITION.itemsize
+
+        if count == 0:
+            continue
+
+        positions = np.memmap(
+            path, dtype=POSITION, mode='r', offset=HEADER.size, shape=(count,)
+        )
+
+        for start in range(0, count, chunk_size):
+            yield size, positions[start : start + chunk_size]
+
+
+def record_games(
+    path: str | os.PathLike[str],
+    num_games: int,
+    player1: AI = AI.RANDOM,
+    player2: AI = AI.RANDOM,
+    size: int = MAX_SIZE,
+    seed: int | None = None,
+    batch_size: int = DEFAULT_BATCH,
+) -> int:
+    """Append every position of batched games to a file, labeled by the result.
+
+    Positions are taken after each move with the result seen by the player to
+    move next, as a final disc differential. Return the number of positions.
+    """
+    if num_games <= 0:
+        raise ValueError('Number of games must be strictly positive')
+
+    if batch_size <= 0:
+        raise ValueError('Batch size must be strictly positive')
+
+    if not {player1, player2} <= {AI.RANDOM, AI.GREEDY}:
+        raise ValueError('Only the RANDOM and GREEDY players can be batched')
+
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        if read_header(path) != size:
+            raise ValueError(f'Position file is not for size {size}: {path}')
+    else:
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, size))
+
+    rng = np.random.default_rng(seed)
+    total = 0
+
+    for start in range(0, num_games, batch_size):
+        batch = BatchGames(min(batch_size, num_games - start), size)
+        greedy = (player1 is AI.GREEDY, player2 is AI.GREEDY)
+        plies = []
+
+        while batch.step(greedy, rng):
+            playing = np.flatnonzero(~batch.done)
+            plies.append(
+                (
+                    playing,
+                    batch.black[playing],
+                    batch.white[playing],
+                    batch.player[playing],
+                )
+            )
+
+        difference = popcount(batch.black) - popcount(batch.white)
+        games = np.concatenate([ply[0] for ply in plies])
+        positions = np.empty(len(games), dtype=POSITION)
+        positions['black'] = np.concatenate([ply[1] for ply in plies])
+        positions['white'] = np.concatenate([ply[2] for ply in plies])
+        positions['player'] = np.concatenate([ply[3] for ply in plies])
+        positions['result'] = np.where(
+            positions['player'] == Color.BLACK,
+            difference[games],
+            -difference[games],
+        )
+
+        with open(path, 'ab') as file:
+            positions.tofile(file)
+
+        total += len(positions)
+
+    return total
+
+
+def sigmoid(x: NDArray[np.float64]) -> NDArray[np.float64]:
+    # the hyperbolic tangent form cannot overflow for large scores
+    return 0.5 * (1 + np.tanh(x / 2))
+
+
+def tune(
+    paths: Sequence[str | os.PathLike[str]],
+    score: WeightedScore = BALANCED,
+    epochs: int = DEFAULT_EPOCHS,
+    learning_rate: float = DEFAULT_LEARNING_RATE,
+    chunk_size: int = DEFAULT_CHUNK,
+    step_size: int = DEFAULT_STEP,
+    seed: int | None = None,
+    verbose: bool = True,
+) -> WeightedScore:
+    """Fit the weights of every feature of ``Board.features`` to game results.
+
+    The score to start from may only weigh those features, and the tuned score
+    weighs all of them. Positions where neither player can move are skipped,
+    since searches score them by their result rather than by weights.
+
+    Chunks are read in a random order and shuffled, then the weights take an
+    Adam step for every ``step_size`` positions.
+    """
+    if epochs <= 0:
+        raise ValueError('Number of epochs must be strictly positive')
+
+    if chunk_size <= 0:
+        raise ValueError('Chunk size must be strictly positive')
+
+    if step_size <= 0:
+        raise ValueError('Step size must be strictly positive')
+
+    if any(scorer not in FEATURES for scorer in score.scorers):
+        raise ValueError('Only features counted by Board.features can be tuned')
+
+    rng = np.random.default_rng(seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        features, results = _count_features(paths, directory, chunk_size, verbose)
+        count = len(results)
+
+        if count == 0:
+            raise ValueError('No positions to tune on')
+
+        weights = np.array(score.weights[:NUM_FEATURES], dtype=np.float64)
+        starts = range(0, count, chunk_size)
+        sample = np.sort(rng.choice(count, min(count, chunk_size), replace=False))
+        scale, loss = fit_scale(features[sample] @ weights, results[sample])
+
+        if verbose:
+            print(f'scale {scale:.4g} fitted to the starting weights, loss {loss:.6f}')
+
+        # descend on the scaled weights, which keeps the step size meaningful
+        # whatever the magnitude of the weights
+        scaled = weights * scale
+        mean = np.zeros(NUM_FEATURES)
+        variance = np.zeros(NUM_FEATURES)
+        steps = 0
+
+        for epoch in range(1, epochs + 1):
+            start_time = time.perf_counter()
+            loss = 0.0
+
+            for start in rng.permutation(starts):
+                order = rng.permutation(min(chunk_size, count - start))
+                chunk = np.asarray(features[start : start + chunk_size], np.float64)
+                targets = np.array(results[start : start + chunk_size])
+
+                for offset in range(0, len(order), step_size):
+                    rows = order[offset : offset + step_size]
+                    x = chunk[rows]
+                    expected = sigmoid(x @ scaled)
+                    error = expected - targets[rows]
+                    loss += float(error @ error)
+                    slope = error * expected * (1 - expected)
+                    gradient = slope @ x * (2 / len(rows))
+
+                    steps += 1
+                    mean = BETA_1 * mean + (1 - BETA_1) * gradient
+                    variance = BETA_2 * variance + (1 - BETA_2) * gradient**2
+                    step = mean / (1 - BETA_1**steps)
+                    step /= np.sqrt(variance / (1 - BETA_2**steps)) + EPSILON
+                    scaled -= learning_rate * step
+
+            if verbose:
+                elapsed = time.perf_counter() - start_time
+                print(
+                    f'epoch {epoch}/{epochs}: loss {loss / count:.6f} over '
+                    f'{count:,d} positions in {elapsed:.2f}s'
+                )
+
+        del features, results
+
+    weights = scaled / scale
+    return WeightedScore(
+        {SCORERS[feature]: float(weights[feature]) for feature in Feature}
+    )
+
+
+def _count_features(
+    paths: Sequence[str | os.PathLike[str]],
+    directory: str,
+    chunk_size: int,
+    verbose: bool,
+) -> tuple[NDArray[np.int8], NDArray[np.float64]]:
+    """Count the feature differences and results of every position.
+
+    They are written to scratch files and mapped back, so epochs read a few
+    bytes per position and skip the bitboard work.
+    """
+    features_path = os.path.join(directory, 'features')
+    results_path = os.path.join(directory, 'results')
+    games: dict[int, BatchGames] = {}
+    count = 0
+
+    with open(features_path, 'wb') as features, open(results_path, 'wb') as results:
+        for size, positions in read_positions(paths, chunk_size):
+            batch = games.setdefault(size, BatchGames(1, size))
+            white = positions['player'] == Color.WHITE
+            current = np.where(white, positions['white'], positions['black'])
+            opponent = np.where(white, positions['black'], positions['white'])
+            counts = batch.features(current, opponent)
+            playing = (counts[:, Feature.MOBILITY] > 0) | (
+                counts[:, Feature.MOBILITY + NUM_FEATURES] > 0
+            )
+            difference = counts[:, :NUM_FEATURES] - counts[:, NUM_FEATURES:]
+            difference[playing].astype(np.int8).tofile(features)
+            result = positions['result'][playing]
+            # a win counts as 1, a draw as a half and a loss as 0
+            ((np.sign(result) + 1) / 2).astype(np.float64).tofile(results)
+            count += int(playing.sum())
+
+            if verbose:
+                print(f'\rcounted features of {count:,d} positions', end='')
+
+    if verbose:
+        print()
+
+    if count == 0:
+        return np.empty((0, NUM_FEATURES), np.int8), np.empty(0, np.float64)
+
+    return (
+        np.memmap(features_path, np.int8, 'r', shape=(count, NUM_FEATURES)),
+        np.memmap(results_path, np.float64, 'r', shape=(count,)),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m pythello.tune')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help='record positions from self-play')
+    record.add_argument('path')
+    record.add_argument('num_games', type=int)
+    record.add_argument('--player1', choices=('RANDOM', 'GREEDY'), default='RANDOM')
+    record.add_argument('--player2', choices=('RANDOM', 'GREEDY'), default='RANDOM')
+    record.add_argument('--size', type=int, default=MAX_SIZE)
+    record.add_argument('--seed', type=int)
+
+    fit = commands.add_parser('fit', help='tune weights on recorded positions')
+    fit.add_argument('output', help='JSON file loadable with WeightedScore.load')
+    fit.add_argument('paths', nargs='+')
+    fit.add_argument('--start', help='weights to start from instead of BALANCED')
+    fit.add_argument('--epochs', type=int, default=DEFAULT_EPOCHS)
+    fit.add_argument('--learning-rate', type=float, default=DEFAULT_LEARNING_RATE)
+    fit.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK)
+    fit.add_argument('--step-size', type=int, default=DEFAULT_STEP)
+    fit.add_argument('--seed', type=int)
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        start_time = time.perf_counter()
+        count = record_games(
+            args.path,
+            args.num_games,
+            AI[args.player1],
+            AI[args.player2],
+            args.size,
+            args.seed,
+        )
+        elapsed = time.perf_counter() - start_time
+        print(f'recorded {count:,d} positions in {elapsed:.1f}s')
+    else:
+        # the fit reads the weights directly, so the loaded score is not wrapped
+        # in a ScorerWrapper, which only adds the scoring of finished games
+        tuned = tune(
+            args.paths,
+            BALANCED if args.start is None else WeightedScore.load(args.start),
+            args.epochs,
+            args.learning_rate,
+            args.chunk_size,
+            args.step_size,
+            args.seed,
+        )
+        tuned.save(args.output)
+        print(
+            ', '.join(
+                f'{scorer.__name__} {weight:.3f}'
+                for scorer, weight in tuned.scorers.items()
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from pythello.board import Board, Color, iterate_position
+from pythello.board.geometry import get_geometry
+
+SIZES = (4, 6, 8, 10, 12)
+NUM_GAMES = 5
+SEED = 0
+
+
+def scratch_hash(board: Board) -> int:
+    """Hash a board square by square from the piece keys."""
+    pieces = get_geometry(board.size).zobrist_pieces
+    result = 0
+
+    for color in Color:
+        for square in iterate_position(board.players[color]):
+            result ^= pieces[color][square.bit_length() - 1]
+
+    return result
+
+
+def random_game(size: int, rng: random.Random) -> list[tuple[Board, Color, int]]:
+    """Return every position of a random game with the side to move and move."""
+    board = Board(size)
+    player = Color.BLACK
+    plies: list[tuple[Board, Color, int]] = []
+
+    while True:
+        moves = board.moves(player)
+
+        if not moves:
+            player = player.opponent
+            moves = board.moves(player)
+
+            if not moves:
+                return plies
+
+        move = rng.choice(list(iterate_position(moves)))
+        plies.append((board.copy(), player, move))
+        board.apply(move, player)
+        player = player.opponent
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_apply_undo_round_trip(size: int) -> None:
+    rng = random.Random(SEED)
+
+    for _ in range(NUM_GAMES):
+        plies = random_game(size, rng)
+        board = Board(size)
+        undo = []
+
+        for before, player, move in plies:
+            flips = board.apply(move, player)
+            opponent = player.opponent
+
+            assert flips == before.flips(player, move)
+            assert board.players[player] == before.players[player] | move | flips
+            assert board.players[opponent] == before.players[opponent] ^ flips
+
+            undo.append((before, player, move, flips))
+
+        # unwind the whole game, checking every position on the way back
+        for before, player, move, flips in reversed(undo):
+            board.undo(move, flips, player)
+
+            assert board.players == before.players
+            assert board.zobrist(player) == before.zobrist(player)
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_incremental_zobrist(size: int) -> None:
+    rng = random.Random(SEED)
+
+    for _ in range(NUM_GAMES):
+        for before, player, move in random_game(size, rng):
+            board = before.copy()
+            board.apply(move, player)
+            black, white = board.players
+            scratch = Board.from_players(black, white, size)
+
+            # black to move adds no side key, so this is the board hash itself,
+            # which hash() would truncate to a signed value
+            assert board.zobrist(Color.BLACK) == scratch_hash(board)
+            assert board.zobrist(player) == scratch.zobrist(player)
+            assert board.zobrist(player) != board.zobrist(player.opponent)
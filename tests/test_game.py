@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import pytest
+
+from pythello.board import Board
+from pythello.game import Game
+from pythello.player import AI
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_verbose_series_prints_scores(
+    workers: int | None, capsys: pytest.CaptureFixture[str]
+) -> None:
+    Game.series(Board(), AI.GREEDY, AI.RANDOM, 2, True, 0, workers)
+    lines = capsys.readouterr().out.splitlines()
+
+    assert lines.count('Game over!') == 2
+    assert sum(line.startswith('AI.GREEDY (black) score: ') for line in lines) == 2
+
+
+def test_quiet_series_prints_one_line_per_game(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    Game.series(Board(), AI.GREEDY, AI.RANDOM, 2, seed=0, workers=2)
+    serial = Game.series(Board(), AI.GREEDY, AI.RANDOM, 2, seed=0)
+    lines = capsys.readouterr().out.splitlines()
+
+    assert len(lines) == 4
+    assert sorted(lines[:2]) == sorted(lines[2:])
+    assert sum(serial.values()) == 2
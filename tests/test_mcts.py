@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from pythello.board import Board, Color
+from pythello.player import MCTS
+
+
+def test_tiny_time_limit_returns_valid_move() -> None:
+    board = Board()
+    searcher = MCTS(playouts=None, time_limit=1e-7)
+    move = searcher.search(board, Color.BLACK)
+
+    assert move & board.moves(Color.BLACK)
+    assert searcher.completed == 1
+
+
+def test_reused_tree_with_tiny_time_limit() -> None:
+    board = Board()
+    searcher = MCTS(playouts=10)
+    move = searcher.search(board, Color.BLACK)
+    board.apply(move, Color.BLACK)
+    searcher.playouts, searcher.time_limit = None, 1e-7
+    reply = searcher.search(board, Color.WHITE)
+
+    assert reply & board.moves(Color.WHITE)
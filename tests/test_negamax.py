@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from benchmarks.positions import random_positions
+from pythello.board import iterate_position
+from pythello.player import Negamax
+from pythello.player.negamax.tree import TreeFlag, TreeNode
+from pythello.score import Score
+
+
+def test_root_move_ignores_deeper_cached_entry() -> None:
+    ((board, player),) = random_positions(8, 1, 20)
+    clean = Negamax(Score.BALANCED, depth=2, cache_mb=1.0)
+    expected = clean.search(board, player)
+    score = clean.score
+    assert score is not None
+    worse = [
+        move
+        for move in iterate_position(board.moves(player))
+        if -clean.evaluate(board.peek(move, player), player.opponent, 1) < score
+    ]
+
+    # an older, deeper fail-low entry keeps the slot that is probed first
+    searcher = Negamax(Score.BALANCED, depth=2, cache_mb=1.0)
+    black, white = board.players
+    stale = TreeNode(worse[0], 0.0, 10, TreeFlag.UPPER, black, white)
+    searcher.cache[board.zobrist(player)] = stale
+
+    assert searcher.search(board, player) == expected
+    assert searcher.score == score
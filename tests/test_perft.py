@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.perft import REFERENCE, perft
+from pythello.board import Board, Color
+
+# deeper counts take seconds each, and are left to the benchmark
+MAX_LEAVES = 10_000
+CASES = [
+    (size, depth, count)
+    for size, counts in REFERENCE.items()
+    for depth, count in enumerate(counts, 1)
+    if count <= MAX_LEAVES
+]
+
+
+@pytest.mark.parametrize(('size', 'depth', 'expected'), CASES)
+def test_perft(size: int, depth: int, expected: int) -> None:
+    assert perft(Board(size), Color.BLACK, depth) == expected
+
+
+def test_perft_restores_board() -> None:
+    board = Board()
+    perft(board, Color.BLACK, 4)
+
+    assert board == Board()
+    assert board.zobrist(Color.BLACK) == Board().zobrist(Color.BLACK)
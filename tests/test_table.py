@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from pythello.player.negamax import TranspositionTable
+from pythello.player.negamax.tree import TreeFlag, TreeNode
+
+
+def node(move: int, depth: int) -> TreeNode:
+    return TreeNode(move, float(depth), depth, TreeFlag.EXACT, 0, 0)
+
+
+def test_deeper_result_swaps_slots() -> None:
+    table = TranspositionTable(0.001)
+    # two keys sharing a bucket
+    first, second = 1, 1 + table._num_buckets
+    table[first] = node(1 << 1, 5)
+    table[second] = node(1 << 2, 1)
+    table[second] = node(1 << 3, 7)
+
+    assert table[first] == node(1 << 1, 5)
+    assert table[second] == node(1 << 3, 7)
+    assert len(table) == 2
+    assert table.overwrites == 0
+
+
+def test_shallower_result_keeps_deeper_one() -> None:
+    table = TranspositionTable(0.001)
+    table[1] = node(1 << 1, 5)
+    table[1] = node(1 << 2, 3)
+
+    assert len(table) == 1
+    assert sorted(table) == [1]